@@ -0,0 +1,128 @@
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+
+import numpy
+
+import benchmarks.simulation as simulation
+import src.region_data as region_data
+import src.world_generator as world_generator
+
+
+def run(args):
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            if size == "stock":
+                region_file, distances = "data/regions.txt", "data/map.json"
+            else:
+                region_file, graph_file = world_generator.write(
+                    directory, int(size), degree=args.degree, distribution=args.populations,
+                    seed=args.seed
+                )
+                distances = region_data.read_graph(graph_file)
+            print("benchmarking " + size + " map", file=sys.stderr)
+
+            result = {
+                "world": simulation.bench_world(region_file, distances, args.repeats),
+                "distance_between": simulation.bench_distances(
+                    region_file, distances, args.sources, args.seed
+                )
+            }
+            engines = ["vector"]
+            if size == "stock" or int(size) <= args.object_limit:
+                engines.insert(0, "object")
+            for engine in engines:
+                result["simulate_turn." + engine] = simulation.bench_turns(
+                    region_file, distances, engine, args.turns, args.seed
+                )
+                result["game." + engine] = simulation.bench_games(
+                    region_file, distances, engine, args.games, args.max_turns, args.seed
+                )
+            results[size] = result
+    return results
+
+
+def compare(results, previous, threshold):
+    """ prints every operation whose median got more than threshold times slower """
+    regressions = 0
+    for size, operations in results.items():
+        for operation, timings in operations.items():
+            try:
+                before = previous["results"][size][operation]["p50"]
+            except KeyError:
+                continue
+            ratio = timings["p50"] / before if before else 1
+            if ratio > threshold:
+                regressions += 1
+                print(
+                    "regression: " + size + " " + operation + " median "
+                    + "{:.3g}s -> {:.3g}s ({:.2f}x)".format(before, timings["p50"], ratio)
+                )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Times world construction, routing, turns and full games and saves json."
+    )
+    parser.add_argument(
+        "--sizes", nargs="+", default=["stock", "100", "1000", "10000"],
+        help="map sizes, stock is the 21 region map in data/ (default: stock 100 1000 10000)"
+    )
+    parser.add_argument("--repeats", type=int, default=20, help="World() constructions per map")
+    parser.add_argument(
+        "--sources", type=int, default=100,
+        help="regions distance_between is timed from, to every region (default: 100)"
+    )
+    parser.add_argument("--turns", type=int, default=50, help="turns timed per engine")
+    parser.add_argument("--games", type=int, default=5, help="full games timed per engine")
+    parser.add_argument("--max-turns", type=int, default=1000, help="turn cap for full games")
+    parser.add_argument(
+        "--object-limit", type=int, default=1000,
+        help="largest map the per-object engine is timed on (default: 1000)"
+    )
+    parser.add_argument(
+        "--degree", type=float, default=4, help="mean links per region of random maps (default: 4)"
+    )
+    parser.add_argument(
+        "--populations", choices=world_generator.POPULATIONS, default="lognormal",
+        help="population distribution of random maps (default: lognormal)"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="previous results file to check for regressions")
+    parser.add_argument(
+        "--threshold", type=float, default=1.25,
+        help="slowdown in median time reported as a regression (default: 1.25)"
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    output = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": numpy.__version__,
+            "machine": platform.machine(),
+            "arguments": vars(args)
+        },
+        "results": results
+    }
+    with open(args.output, "w") as output_file:
+        json.dump(output, output_file, indent=4)
+    print(json.dumps(results, indent=4))
+
+    if args.compare:
+        with open(args.compare) as previous_file:
+            previous = json.load(previous_file)
+        if compare(results, previous, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import time
+
+import numpy
+
+from src.turn_simulation import simulate_turn
+from src.virus import Virus
+from src.world import World
+
+
+def latencies(timings):
+    """ summary of a list of per operation timings in seconds """
+    timings = numpy.array(timings)
+    return {
+        "count": len(timings),
+        "total": float(timings.sum()),
+        "mean": float(timings.mean()),
+        "p50": float(numpy.percentile(timings, 50)),
+        "p90": float(numpy.percentile(timings, 90)),
+        "p99": float(numpy.percentile(timings, 99)),
+        "max": float(timings.max())
+    }
+
+
+def release(world):
+    """ a high impact virus in the first region, strong enough to end a game """
+    return Virus(1000000, 90, 5, industry=0, start_region=world.region_list[0])
+
+
+def bench_world(region_file, distances, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        World(region_file, distances)
+        timings.append(time.perf_counter() - start)
+    return latencies(timings)
+
+
+def bench_distances(region_file, distances, sources, seed):
+    """ distance_between from up to sources regions to every region, on a new world
+
+    the first lookup from each source includes building its row of the route table
+    """
+    world = World(region_file, distances)
+    regions = world.region_list
+    rng = numpy.random.default_rng(seed)
+    if len(regions) > sources:
+        chosen = [regions[num] for num in rng.choice(len(regions), sources, replace=False)]
+    else:
+        chosen = regions
+
+    timings = []
+    for region1 in chosen:
+        for region2 in regions:
+            start = time.perf_counter()
+            world.distance_between(region1, region2)
+            timings.append(time.perf_counter() - start)
+    return latencies(timings)
+
+
+def bench_turns(region_file, distances, engine, turns, seed):
+    """ simulate_turn on one world for up to turns turns """
+    world = World(region_file, distances)
+    virus = release(world)
+    rng = numpy.random.default_rng(seed)
+
+    timings = []
+    for _ in range(turns):
+        start = time.perf_counter()
+        result = simulate_turn(world, virus, engine, rng=rng)
+        timings.append(time.perf_counter() - start)
+        if result is None or world.population == 0:
+            break
+    return latencies(timings)
+
+
+def bench_games(region_file, distances, engine, games, max_turns, seed):
+    """ full games until extinction, cure or max_turns, each on a reset world """
+    world = World(region_file, distances)
+
+    timings = []
+    turns = []
+    for game in range(games):
+        start = time.perf_counter()
+        world.reset()
+        virus = release(world)
+        rng = numpy.random.default_rng(seed + game)
+        turn = 0
+        while turn < max_turns:
+            turn += 1
+            if simulate_turn(world, virus, engine, rng=rng) is None or world.population == 0:
+                break
+        timings.append(time.perf_counter() - start)
+        turns.append(turn)
+
+    output = latencies(timings)
+    output["mean_turns"] = sum(turns) / len(turns)
+    return output
@@ -1,6 +1,8 @@
 import logging
+import src.assets as assets
 import src.loop as loop
 import src.graphics as graphics
+import src.scheduler as scheduler
 
 
 # logging
@@ -16,11 +18,25 @@ log.addHandler(stream_handler)
 log.info("Logging initialised")
 
 
+# times each phase up to the first frame, reported once it is drawn
+startup = scheduler.StartupTimer()
+
 log.info("Initialising graphics")
+startup.phase("graphics")
 display = graphics.Graphics()
+log.info("Preloading region images")
+startup.phase("preload")
+display.assets.preload(
+    assets.region_image_paths(),
+    lambda loaded, total, path: log.debug(
+        "preloaded " + str(loaded) + "/" + str(total) + " images: " + path
+    )
+)
 log.info("Initialising main loop")
-loop = loop.Main(display)
+startup.phase("main loop")
+loop = loop.Main(display, startup=startup)
 
 
 log.info("Starting game")
+startup.phase("first frame")
 loop()
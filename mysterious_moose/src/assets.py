@@ -0,0 +1,218 @@
+import argparse
+import glob
+import json
+import logging
+import os
+import threading
+
+import pygame
+
+log = logging.getLogger("main.assets")
+log.setLevel(logging.INFO)
+
+ATLAS = "assets/atlas.png"
+REGION_IMAGES = "assets/images/regions/"
+ICONS = [
+    "assets/images/world.png",
+    "assets/images/right-arrow.png",
+    "assets/images/left-arrow.png",
+    "assets/images/up-arrow.png",
+    "assets/images/down-arrow.png"
+]
+
+
+def region_image_paths():
+    """ paths of the per region map layers, the world map base layer isn't one """
+    return [
+        path for path in sorted(glob.glob(REGION_IMAGES + "*.png"))
+        if os.path.basename(path) != "world_map.png"
+    ]
+
+
+def _key(path):
+    """ paths are normalised so the same file is loaded once however it is written """
+    return os.path.normpath(path).replace(os.sep, "/")
+
+
+class Sprite:
+    """ an image trimmed to its visible pixels and where it goes in the untrimmed image """
+    __slots__ = ("surface", "offset", "size")
+
+    def __init__(self, surface, offset, size):
+        self.surface = surface
+        self.offset = tuple(offset)
+        self.size = tuple(size)
+
+    def untrimmed(self):
+        """ the image at its original size """
+        if self.offset == (0, 0) and self.surface.get_size() == self.size:
+            return self.surface
+        image = pygame.Surface(self.size, pygame.SRCALPHA)
+        # new surfaces are fully transparent, so taking the maximum copies without blending
+        image.blit(self.surface, self.offset, special_flags=pygame.BLEND_RGBA_MAX)
+        return image
+
+
+class Assets:
+    """ path keyed image store, every file is read at most once
+
+    images are loaded on first use, or ahead of time on a background thread with preload. images
+    packed in the atlas (made with python -m src.assets, see pack) are used in place of the
+    files they were packed from.
+    """
+
+    def __init__(self, atlas=ATLAS):
+        self._images = {}
+        self._sprites = {}
+        self._lock = threading.RLock()
+
+        # the atlas is loaded when the first image is asked for
+        self._atlas = atlas if atlas is not None and os.path.exists(atlas) else None
+
+    def __contains__(self, path):
+        self._load_atlas()
+        key = _key(path)
+        return key in self._images or key in self._sprites
+
+    def _load_atlas(self):
+        if self._atlas is not None:
+            with self._lock:
+                if self._atlas is not None:
+                    atlas, self._atlas = self._atlas, None
+                    self.load_atlas(atlas)
+
+    def load_atlas(self, path):
+        """ makes the images packed in the atlas at path available under their original paths """
+        with open(os.path.splitext(path)[0] + ".json") as index_file:
+            index = json.load(index_file)
+        atlas = pygame.image.load(os.path.join(os.path.dirname(path), index["image"]))
+        with self._lock:
+            for original, sprite in index["sprites"].items():
+                self._sprites[_key(original)] = Sprite(
+                    atlas.subsurface(sprite["rect"]), sprite["offset"], sprite["size"]
+                )
+        log.info("loaded atlas " + path + " with " + str(len(index["sprites"])) + " images")
+
+    def _load(self, key):
+        image = pygame.image.load(key)
+        with self._lock:
+            # another thread may have loaded it meanwhile, keep the first so callers share it
+            return self._images.setdefault(key, image)
+
+    def image(self, path):
+        """ the image at path, loaded the first time it is asked for """
+        self._load_atlas()
+        key = _key(path)
+        image = self._images.get(key)
+        if image is not None:
+            return image
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            with self._lock:
+                return self._images.setdefault(key, sprite.untrimmed())
+        return self._load(key)
+
+    def sprite(self, path):
+        """ the image at path trimmed to its visible pixels, as a Sprite
+
+        atlas images are already trimmed, other images are trimmed when first asked for
+        """
+        self._load_atlas()
+        key = _key(path)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            image = self.image(key)
+            rect = image.get_bounding_rect()
+            sprite = Sprite(image.subsurface(rect), rect.topleft, image.get_size())
+            with self._lock:
+                sprite = self._sprites.setdefault(key, sprite)
+        return sprite
+
+    def preload(self, paths, progress=None):
+        """ loads paths on a background thread, returns the started thread
+
+        progress(loaded, total, path) is called from that thread after each path. paths already
+        loaded or in an atlas are skipped but still counted
+        """
+        paths = list(paths)
+
+        def load():
+            for num, path in enumerate(paths):
+                if path not in self:
+                    try:
+                        self._load(_key(path))
+                    except (pygame.error, FileNotFoundError):
+                        log.exception("could not preload " + path)
+                if progress is not None:
+                    progress(num + 1, len(paths), path)
+
+        thread = threading.Thread(target=load, name="asset preload", daemon=True)
+        thread.start()
+        return thread
+
+
+def pack(paths, output, width=4096, padding=1):
+    """ packs the images at paths into an atlas png at output and writes its json index
+
+    images are trimmed to their visible pixels and placed on shelves. the index, next to output
+    with a .json extension, is of the form:
+
+        {
+            "image": "atlas.png",
+            "sprites": {
+                "<original path>": {"rect": [x, y, w, h], "offset": [x, y], "size": [w, h]}
+            }
+        }
+
+    rect is where the trimmed image is in the atlas, offset where it was in the original image
+    and size the original image's size
+    """
+    sprites = []
+    for path in paths:
+        image = pygame.image.load(path)
+        rect = image.get_bounding_rect()
+        sprites.append((_key(path), image.subsurface(rect), rect.topleft, image.get_size()))
+
+    # shelf packing, tallest images first
+    sprites.sort(key=lambda sprite: sprite[1].get_height(), reverse=True)
+    placed = []
+    x = y = shelf_height = 0
+    for key, surface, offset, size in sprites:
+        w, h = surface.get_size()
+        if w > width:
+            raise ValueError(key + " is wider than the atlas")
+        if x + w > width:
+            x, y, shelf_height = 0, y + shelf_height + padding, 0
+        placed.append((key, surface, (x, y, w, h), offset, size))
+        x += w + padding
+        shelf_height = max(shelf_height, h)
+
+    atlas = pygame.Surface((width, y + shelf_height), pygame.SRCALPHA)
+    index = {"image": os.path.basename(output), "sprites": {}}
+    for key, surface, rect, offset, size in placed:
+        atlas.blit(surface, rect[:2], special_flags=pygame.BLEND_RGBA_MAX)
+        index["sprites"][key] = {"rect": list(rect), "offset": list(offset), "size": list(size)}
+
+    pygame.image.save(atlas, output)
+    with open(os.path.splitext(output)[0] + ".json", "w") as index_file:
+        json.dump(index, index_file, indent=4)
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.assets",
+        description="Packs images into a texture atlas, by default the region layers and icons."
+    )
+    parser.add_argument("paths", nargs="*", help="images to pack (default: regions and icons)")
+    parser.add_argument("--output", default=ATLAS)
+    parser.add_argument("--width", type=int, default=4096, help="atlas width in pixels")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or region_image_paths() + ICONS
+    index = pack(paths, args.output, args.width)
+    print("packed " + str(len(index["sprites"])) + " images into " + args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+import argparse
+import itertools
+import json
+import os
+import tempfile
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy
+
+import src.region_data as region_data
+from src.history import History
+from src.turn_simulation import simulate_turn
+from src.virus import Virus
+from src.world import World, INDUSTRIES
+
+
+class VirusSpec:
+    """ the stats every game in a batch releases its virus with """
+
+    def __init__(self, impact, virulence, detectability, industry, start_region):
+        self.impact = impact
+        self.virulence = virulence
+        self.detectability = detectability
+        self.industry = industry
+        self.start_region = start_region
+
+    def create(self, world):
+        """ creates the virus, released in the start region of the given world """
+        return Virus(
+            self.impact,
+            self.virulence,
+            self.detectability,
+            industry=self.industry,
+            start_region=world.regions[self.start_region]
+        )
+
+
+class GameResult:
+    """ outcome of a single headless game """
+
+    def __init__(self, seed, turns, extinct, wipe_outs):
+        self.seed = seed
+        self.turns = turns  # number of turns played
+        self.extinct = extinct  # whether the world population reached 0
+        self.wipe_outs = wipe_outs  # region name: turn the region was wiped out on
+
+
+class BatchStatistics:
+    """ aggregate statistics of a batch of games
+
+    turn counts are kept as histograms so memory stays the same however many games are added
+    """
+
+    def __init__(self):
+        self.games = 0
+        self.extinctions = 0
+        self.extinction_turns = Counter()  # turns to extinction: number of games
+        self.wipe_out_turns = {}  # region name: Counter of turn wiped out on: number of games
+
+    def add(self, result):
+        """ adds a single GameResult """
+        self.games += 1
+        if result.extinct:
+            self.extinctions += 1
+            self.extinction_turns[result.turns] += 1
+        for region_name, turn in result.wipe_outs.items():
+            self.wipe_out_turns.setdefault(region_name, Counter())[turn] += 1
+
+    def merge(self, other):
+        """ adds the games of another BatchStatistics """
+        self.games += other.games
+        self.extinctions += other.extinctions
+        self.extinction_turns.update(other.extinction_turns)
+        for region_name, turns in other.wipe_out_turns.items():
+            self.wipe_out_turns.setdefault(region_name, Counter()).update(turns)
+
+    def summary(self):
+        """ returns the statistics as a json serialisable dict """
+        return {
+            "games": self.games,
+            "extinction_probability": self.extinctions / self.games if self.games else 0,
+            "turns_to_extinction": describe(self.extinction_turns),
+            "regions": {
+                region_name: dict(
+                    wipe_out_probability=sum(turns.values()) / self.games,
+                    **describe(turns)
+                )
+                for region_name, turns in sorted(self.wipe_out_turns.items())
+            }
+        }
+
+
+def percentile(histogram, fraction):
+    """ value below which the given fraction of a {value: count} histogram lies """
+    target = fraction * sum(histogram.values())
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if seen >= target:
+            return value
+
+
+def describe(histogram):
+    """ summary statistics of a {value: count} histogram """
+    count = sum(histogram.values())
+    if count == 0:
+        return {"count": 0}
+    return {
+        "count": count,
+        "mean": sum(value * number for value, number in histogram.items()) / count,
+        "min": min(histogram),
+        "median": percentile(histogram, 0.5),
+        "p90": percentile(histogram, 0.9),
+        "max": max(histogram)
+    }
+
+
+def run_game(spec, seed, max_turns, engine="object", world=None, history=None,
+             region_file="data/regions.txt", map_file="data/map.json"):
+    """ plays one game without any prompts until extinction, the virus is cured or max_turns
+
+    a world from a previous game can be passed in, it is reset instead of loading a new one from
+    region_file and map_file. if a History is passed in it is cleared and given the starting
+    state and every turn
+    """
+    rng = numpy.random.default_rng(seed)
+
+    if world is None:
+        world = World(region_file, map_file)
+    else:
+        world.reset()
+    virus = spec.create(world)
+    wipe_outs = {}
+    extinct = False
+    if history is not None:
+        history.clear()
+        history.record(world, [virus.infection])
+
+    turn = 0
+    while turn < max_turns:
+        turn += 1
+        result = simulate_turn(world, virus, engine, rng=rng)
+        if history is not None:
+            history.record(world, [virus.infection])
+
+        for region in world.regions.values():
+            if region.destroyed and region.name not in wipe_outs:
+                wipe_outs[region.name] = turn
+
+        if world.population == 0:
+            extinct = True
+            break
+        if result is None:
+            # the virus has been wiped out
+            break
+
+    return GameResult(seed, turn, extinct, wipe_outs)
+
+
+def history_path(history_dir, seed):
+    """ where the History of the game played with seed is saved in history_dir """
+    return os.path.join(history_dir, "game_" + str(seed) + ".npz")
+
+
+def run_batch(spec, seeds, max_turns, engine="object", world=None,
+              region_file="data/regions.txt", history_dir=None, map_file="data/map.json"):
+    """ plays a game for every seed, returning the combined BatchStatistics
+
+    games are played on world, or on a world loaded from region_file and map_file if it isn't
+    given. with a history_dir, every game's History is saved there (see history_path)
+    """
+    if world is None:
+        world = World(region_file, map_file)
+    # one History reused by every game, so its arrays are only grown once
+    history = History(world) if history_dir is not None else None
+    statistics = BatchStatistics()
+    for seed in seeds:
+        statistics.add(run_game(spec, seed, max_turns, engine, world, history))
+        if history is not None:
+            history.save(history_path(history_dir, seed))
+    return statistics
+
+
+# world reused by every game a worker process plays, set by _start_worker
+_worker_world = None
+
+
+def _start_worker(region_file, map_file):
+    global _worker_world
+    _worker_world = World(region_file, map_file)
+
+
+def _run_chunk(spec, seeds, max_turns, engine, history_dir):
+    return run_batch(spec, seeds, max_turns, engine, _worker_world, history_dir=history_dir)
+
+
+def run_parallel(spec, seeds, max_turns, engine="object", workers=None, chunk_size=64,
+                 region_file="data/regions.txt", history_dir=None,
+                 map_file="data/map.json"):
+    """ plays a game for every seed across a pool of worker processes
+
+    seeds are sent out in chunks with at most two chunks queued per worker, and each chunk's
+    BatchStatistics is merged as soon as it finishes so memory doesn't grow with the batch size.
+    workers defaults to the number of CPUs. a tsv region_file is converted to a .npy table once,
+    which every worker memory maps rather than parsing the tsv itself. map_file and history_dir
+    are as for run_batch, each worker saves the histories of the games it plays.
+    """
+    workers = workers or os.cpu_count() or 1
+    seeds = iter(seeds)
+    statistics = BatchStatistics()
+
+    with tempfile.TemporaryDirectory() as directory:
+        if os.path.splitext(region_file)[1] != ".npy":
+            table_file = os.path.join(directory, "regions.npy")
+            region_data.convert(region_file, table_file)
+            region_file = table_file
+
+        with ProcessPoolExecutor(
+                max_workers=workers, initializer=_start_worker, initargs=(region_file, map_file)
+        ) as executor:
+            pending = set()
+            while True:
+                while len(pending) < workers * 2:
+                    chunk = list(itertools.islice(seeds, chunk_size))
+                    if not chunk:
+                        break
+                    pending.add(executor.submit(
+                        _run_chunk, spec, chunk, max_turns, engine, history_dir
+                    ))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    statistics.merge(future.result())
+
+    return statistics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.batch",
+        description="Runs many headless games and prints aggregate statistics as json."
+    )
+    parser.add_argument("--impact", type=int, required=True)
+    parser.add_argument("--virulence", type=int, required=True)
+    parser.add_argument("--detectability", type=int, required=True)
+    parser.add_argument(
+        "--industry", type=int, default=0, choices=range(len(INDUSTRIES)),
+        help=", ".join(str(num) + ": " + name for num, name in enumerate(INDUSTRIES))
+    )
+    parser.add_argument("--start-region", default="West Europe")
+    parser.add_argument(
+        "--seeds", type=int, nargs=2, default=(0, 1000), metavar=("FIRST", "LAST"),
+        help="plays one game per seed in the range FIRST to LAST, excluding LAST"
+    )
+    parser.add_argument("--max-turns", type=int, default=1000)
+    parser.add_argument("--engine", choices=("object", "vector"), default="object")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="number of worker processes, 0 uses one per CPU (default: 1, no pool)"
+    )
+    parser.add_argument(
+        "--regions", default="data/regions.txt",
+        help="region file, a tsv or a .npy table made by python -m src.region_data, holding "
+             "every region of the --map graph (default: data/regions.txt)"
+    )
+    parser.add_argument(
+        "--map", default="data/map.json",
+        help="region graph, a json object of {region: {neighbour: distance}} such as those "
+             "python -m src.world_generator writes (default: data/map.json)"
+    )
+    parser.add_argument("--output", help="file to write the statistics to instead of stdout")
+    parser.add_argument(
+        "--history", metavar="DIRECTORY",
+        help="saves every game's turn by turn history to DIRECTORY/game_<seed>.npz"
+    )
+    args = parser.parse_args(argv)
+
+    if args.history:
+        os.makedirs(args.history, exist_ok=True)
+
+    spec = VirusSpec(
+        args.impact, args.virulence, args.detectability, args.industry, args.start_region
+    )
+    if args.workers == 1:
+        statistics = run_batch(
+            spec, range(*args.seeds), args.max_turns, args.engine, region_file=args.regions,
+            history_dir=args.history, map_file=args.map
+        )
+    else:
+        statistics = run_parallel(
+            spec, range(*args.seeds), args.max_turns, args.engine, args.workers or None,
+            region_file=args.regions, history_dir=args.history, map_file=args.map
+        )
+
+    summary = json.dumps(statistics.summary(), indent=4)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(summary + "\n")
+    else:
+        print(summary)
+
+
+if __name__ == "__main__":
+    main()
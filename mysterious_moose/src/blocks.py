@@ -29,48 +29,73 @@ class BlockGraphic:
         self.image = image
         self.renderer = renderer
 
-        self.card = pygame.Surface((500, 120))
+        # the card is drawn when first used after a resize, see card
+        self.size = None
+        self._card = None
 
         self.resolution = pygame.display.Info()
         self.resolution = (self.resolution.current_w, self.resolution.current_h)
         self.update(self.resolution)
 
     def update(self, resolution):
-        """ updates graphical elements when resolution or virus stats change """
+        """ updates graphical elements when resolution or virus stats change
+
+        only marks the card as out of date, so resizing with many blocks stays cheap
+        """
         self.resolution = resolution
+        size = (resolution[0]//5, int(resolution[0]*0.016))
+        # the card only depends on the width
+        if size != self.size:
+            self.size = size
+            self._card = None
+
+    @property
+    def card(self):
+        """ the card surface at the current resolution """
+        if self._card is None:
+            self._card = self.renderer.cache.get(
+                ("block card", self.name, self.image, self.size), self._draw_card
+            )
+        return self._card
+
+    def _draw_card(self):
+        """ draws the card at self.size """
         colours = {
             "outline": (200, 200, 200),
             "internal": (75, 75, 75),
             "text": (255, 255, 255)
         }
-        self.card = pygame.Surface((1500, 120))
-        self.card.fill(colours["outline"])
+        card = pygame.Surface((1500, 120))
+        card.fill(colours["outline"])
 
         image_bg = pygame.Rect(10, 10, 100, 100)
-        image = pygame.transform.scale(self.image, (100, 100))
+        image = self.renderer.cache.scale(self.image, (100, 100))
 
         text_bg = pygame.Rect(120, 10, 1370, 100)
-        text = self.renderer.fonts["main"].render(self.name, colours["text"], size=100)[0]
+        text = self.renderer.cache.text(
+            self.renderer.fonts["main"], self.name, 100, colours["text"]
+        )
         text_rect = text.get_rect(x=130, centery=60)
 
-        pygame.draw.rect(self.card, colours["internal"], image_bg)
-        pygame.draw.rect(self.card, colours["internal"], text_bg)
+        pygame.draw.rect(card, colours["internal"], image_bg)
+        pygame.draw.rect(card, colours["internal"], text_bg)
 
-        self.card.blit(image, (10, 10))
-        self.card.blit(text, text_rect)
+        card.blit(image, (10, 10))
+        card.blit(text, text_rect)
 
-        self.card = pygame.transform.scale(self.card, (resolution[0]//5, int(resolution[0]*0.016)))
+        return pygame.transform.scale(card, self.size)
 
 
 def get_blocks(renderer):
     """ reads data/blocks.json and creates relevant Block objects """
-    blocks_file = open("src/data/blocks.json")
-    blocks_list = json.load(blocks_file)
+    with open("src/data/blocks.json") as blocks_file:
+        blocks_list = json.load(blocks_file)
     market_blocks = []
     player_blocks = []
 
     for block in blocks_list:
-        graphic = pygame.image.load(open(block["graphic"]))
+        # blocks sharing an image share the loaded surface
+        graphic = renderer.assets.image(block["graphic"])
         block_obj = Block(
             block["name"],
             block["impact"],
@@ -0,0 +1,69 @@
+import numpy
+
+from src.turn_simulation import simulate_turn
+
+
+class BranchOutcome:
+    """ result of playing one candidate virus forward from a snapshot """
+
+    def __init__(self, candidate, seed, world, virus, turns):
+        self.candidate = candidate  # index of the candidate virus
+        self.seed = seed
+        self.turns = turns  # number of turns played
+        self.population = world.population
+        self.co2_concentration = world.co2_concentration
+        self.regions_destroyed = int(world.destroyed.sum())
+        self.infected = len(virus.affected_regions)
+        self.extinct = world.population == 0
+        self.cured = not virus.affected_regions
+
+
+def run_branches(snapshot, candidates, turns, seeds=(0,), engine="object"):
+    """ plays every candidate virus forward from the same snapshot
+
+    snapshot is a WorldSnapshot and candidates a list of viruses infecting regions of the world
+    the snapshot was taken from. every (candidate, seed) pair plays on its own fork for up to
+    turns turns, stopping early at extinction or when the virus is cured. returns a list of
+    BranchOutcome.
+    """
+    outcomes = []
+    for num, candidate in enumerate(candidates):
+        for seed in seeds:
+            rng = numpy.random.default_rng(seed)
+            world = snapshot.fork()
+            virus = candidate.fork(world)
+
+            turn = 0
+            while turn < turns and virus.affected_regions and world.population > 0:
+                turn += 1
+                simulate_turn(world, virus, engine, rng=rng)
+
+            outcomes.append(BranchOutcome(num, seed, world, virus, turn))
+    return outcomes
+
+
+def compare_branches(outcomes):
+    """ averages outcomes per candidate, ordered from the lowest final population
+
+    returns a list of dicts with the candidate index and its mean population, co2 concentration,
+    regions destroyed and the fraction of its branches ending in extinction or a cure
+    """
+    by_candidate = {}
+    for outcome in outcomes:
+        by_candidate.setdefault(outcome.candidate, []).append(outcome)
+
+    summaries = []
+    for candidate, branches in by_candidate.items():
+        count = len(branches)
+        summaries.append({
+            "candidate": candidate,
+            "branches": count,
+            "population": sum(branch.population for branch in branches) / count,
+            "co2_concentration": sum(branch.co2_concentration for branch in branches) / count,
+            "regions_destroyed": sum(branch.regions_destroyed for branch in branches) / count,
+            "extinction_probability": sum(branch.extinct for branch in branches) / count,
+            "cure_probability": sum(branch.cured for branch in branches) / count
+        })
+
+    summaries.sort(key=lambda summary: summary["population"])
+    return summaries
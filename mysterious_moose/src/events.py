@@ -0,0 +1,116 @@
+import json
+
+
+class Event:
+    """ base class of everything the simulation reports
+
+    events only hold names and numbers, formatting is left to the sink that receives them
+    """
+    __slots__ = ()
+    kind = "event"
+
+    def to_dict(self):
+        output = {"event": self.kind}
+        for name in self.__slots__:
+            output[name] = getattr(self, name)
+        return output
+
+
+class TurnStart(Event):
+    __slots__ = ("infected",)
+    kind = "turn_start"
+
+    def __init__(self, infected):
+        self.infected = infected  # names of the regions infected at the start of the turn
+
+    def __str__(self):
+        return "The turn is to begin. Currently infected regions: " + ", ".join(self.infected)
+
+
+class TurnEnd(Event):
+    __slots__ = ("infected",)
+    kind = "turn_end"
+
+    def __init__(self, infected):
+        self.infected = infected  # names of the regions infected at the end of the turn
+
+    def __str__(self):
+        if not self.infected:
+            return "The turn has ended. The virus has been wiped out!"
+        return "The turn has ended. Currently infected regions: " + ", ".join(self.infected)
+
+
+class Infection(Event):
+    __slots__ = ("region", "source")
+    kind = "infection"
+
+    def __init__(self, region, source):
+        self.region = region
+        self.source = source  # region the virus spread from
+
+    def __str__(self):
+        return self.region + " is now infected with the virus from " + self.source + "!"
+
+
+class Cure(Event):
+    __slots__ = ("region",)
+    kind = "cure"
+
+    def __init__(self, region):
+        self.region = region
+
+    def __str__(self):
+        return self.region + " successfully got rid of the virus!"
+
+
+class RegionWipedOut(Event):
+    __slots__ = ("region",)
+    kind = "region_wiped_out"
+
+    def __init__(self, region):
+        self.region = region
+
+    def __str__(self):
+        return self.region + " has been wiped out"
+
+
+class NullSink:
+    """ discards every event, the simulation skips creating events when enabled is False """
+    enabled = False
+
+    def emit(self, event):
+        pass
+
+
+class ListSink:
+    """ keeps every event in memory """
+    enabled = True
+
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event):
+        self.events.append(event)
+
+
+class JSONLinesSink:
+    """ writes one json object per event to a file """
+    enabled = True
+
+    def __init__(self, file):
+        self.file = file
+
+    def emit(self, event):
+        self.file.write(json.dumps(event.to_dict()) + "\n")
+
+
+class ConsoleSink:
+    """ prints each event as a readable sentence """
+    enabled = True
+
+    def emit(self, event):
+        print(event)
+
+
+# shared default sink
+NULL_SINK = NullSink()
@@ -5,9 +5,13 @@ import src.blocks as blocks
 import src.virus as viruses
 import src.world as world
 
+from src.events import ConsoleSink
+from src.scene import Blit, Fill, Scene
 from src.turn_simulation import simulate_turn
 from src.virus import Virus
+from src.widgets import HitIndex, VirtualList
 from src.world import World, INDUSTRIES
+from src.world_map import WorldMap
 
 log = logging.getLogger("main.game")
 log.setLevel(logging.INFO)
@@ -19,100 +23,67 @@ class Game:
         self.graphics = graphics
         self.market_blocks, self.player_blocks = blocks.get_blocks(graphics)
         self.world = world.World()
+        self.world_map = WorldMap(graphics, self.world)
         self.view = 0  # current graphical view
         self.selected = -1  # currently selected virus
         self.viruses = []
-        self.to_render = []
 
         # list of graphical elements
         self.elements = {}
+        # scene of each view, and the nodes in them that change
+        self.scenes = {}
+        self.nodes = {}
+        # card lists of the main view and virus creation view, made with the scenes
+        self.virus_list = None
+        self.player_block_list = None
+        self.virus_block_list = None
+        # per view, a HitIndex of its buttons and lists and the lists in numbering order
+        self.hit_indexes = {}
 
         # whether the mouse is pressed
         self.pressed = False
 
+        # amount of scroll on the main view
+        self.main_view_scroll = 0
+
         # get resolution
         display_info = pygame.display.Info()
         # initialise scalable elements
         self.resolution = (display_info.current_w, display_info.current_h)
         self.resolution_change(self.resolution)
 
-        # amount of scroll on the main view
-        self.main_view_scroll = 0
+    def change_view(self, view):
+        """ switches the graphical view, laying out the lists it shows """
+        self.view = view
+        if view == 0:
+            self._layout_main_view()
+        elif view == 1:
+            self.refresh_world_map()
+        elif view == 4:
+            self._layout_virus_creation()
 
     def update(self, events):
         """ called each loop to update the game """
         # logic
 
         # graphics & mouse interactions
-        # resets things to be rendered
-        self.to_render = []
-
         # gets mouse position
         mouse_pos = pygame.mouse.get_pos()
-        mouse_pos = pygame.Rect(mouse_pos[0], mouse_pos[1], 1, 1)
         mouse_state = pygame.mouse.get_pressed()
-
-        # background
-        self.to_render.append([{"type": "bg", "colour": (0, 0, 0)}])
+        mouse_collision = self._collision(mouse_pos)
 
         if self.view == 0:
             # main view
-
-            # static objects
-            self.to_render.append([
-                {
-                    "type": "surface",
-                    "surface": self.elements["mv.tray"],
-                    "dest": self.elements["mv.tray.loc"]
-                }
-            ])
-
             up_arrow = self.elements["mv.up"]
             down_arrow = self.elements["mv.down"]
             wm_button = self.elements["mv.wm"]
 
             num_of_viruses = len(self.viruses)
             total_card_height = (num_of_viruses + 1)*self.elements["mv.card.dy"]
-            virus_buttons = []
-
-            for num, virus in enumerate(self.viruses):
-                self.to_render.append([{
-                        "type": "surface",
-                        "surface": virus.graphic.card,
-                        "dest": (
-                            self.elements["mv.card.x"],
-                            self.elements["mv.card.dy"]*num + self.main_view_scroll
-                        )
-                    }])
-                virus_buttons.append(
-                    virus.graphic.card.get_rect(
-                        x=self.elements["mv.card.x"],
-                        y=self.elements["mv.card.dy"]*num + self.main_view_scroll
-                    )
-                )
-
-            self.to_render.append([{
-                    "type": "surface",
-                    "surface": self.elements["mv.card.new"],
-                    "dest": (
-                        self.elements["mv.card.x"],
-                        self.elements["mv.card.dy"] * num_of_viruses + self.main_view_scroll
-                    )
-                }])
-            virus_buttons.append(
-                self.elements["mv.card.new"].get_rect(
-                    x=self.elements["mv.card.x"],
-                    y=self.elements["mv.card.dy"] * num_of_viruses + self.main_view_scroll
-                )
-            )
 
-            buttons = [
-                self.elements["mv.buttons.up"],
-                self.elements["mv.buttons.down"],
-                self.elements["mv.buttons.wm"]
-            ]
+            # up, down and world map buttons, the cards are numbered after them
+            num_of_buttons = 3
 
-            mouse_collision = mouse_pos.collidelist(buttons + virus_buttons)
             if mouse_collision > -1:
 
                 if mouse_state[0] == 1:
@@ -130,27 +101,29 @@ class Game:
                         self.main_view_scroll -= self.elements["mv.card.dy"]
                         if self.main_view_scroll < self.resolution[1] - total_card_height:
                             self.main_view_scroll = self.resolution[1] - total_card_height
+                        self._layout_main_view()
                     elif mouse_collision == 1:
                         self.main_view_scroll += self.elements["mv.card.dy"]
                         if self.main_view_scroll > 0:
                             self.main_view_scroll = 0
+                        self._layout_main_view()
                     elif mouse_collision == 2:
-                        self.view = 1
-                    elif mouse_collision > len(buttons) - 1:
-                        virus_collision = mouse_collision - len(buttons)
+                        self.change_view(1)
+                    elif mouse_collision > num_of_buttons - 1:
+                        virus_collision = mouse_collision - num_of_buttons
                         self.selected = virus_collision
-                        if virus_collision == len(virus_buttons) - 1:
+                        if virus_collision == num_of_viruses:
                             log.info("Creating new virus")
                             self.viruses.append(viruses.Virus(self.graphics))
-                            self.view = 4
+                            self.change_view(4)
                         else:
                             if self.viruses[self.selected].released is True:
                                 log.info("Transitioning to virus info view: " + str(self.selected))
-                                self.view = 3
+                                self.change_view(3)
                             else:
                                 log.info(
                                     "Transitioning to virus creation view: " + str(self.selected))
-                                self.view = 4
+                                self.change_view(4)
 
                 else:
                     if mouse_collision == 0:
@@ -163,33 +136,14 @@ class Game:
             else:
                 self.pressed = False
 
-            self.to_render.append([
-                {
-                    "type": "surface",
-                    "surface": up_arrow,
-                    "dest": self.elements["mv.up.loc"]
-                }, {
-                    "type": "surface",
-                    "surface": down_arrow,
-                    "dest": self.elements["mv.down.loc"]
-                }, {
-                    "type": "surface",
-                    "surface": wm_button,
-                    "dest": self.elements["mv.wm.loc"]
-                }
-
-            ])
+            self.nodes["mv.up"].surface = up_arrow
+            self.nodes["mv.down"].surface = down_arrow
+            self.nodes["mv.wm"].surface = wm_button
 
         elif self.view == 1:
             # world map
-            buttons = (
-                self.elements["wm.buttons.mv"],
-            )
-
             mv_button = self.elements["wm.mv"]
 
-            mouse_collision = mouse_pos.collidelist(buttons)
-
             if mouse_collision > -1:
 
                 if mouse_state[0] == 1:
@@ -200,7 +154,7 @@ class Game:
                 elif mouse_state[0] == 0 and self.pressed is True:
                     self.pressed = False
                     if mouse_collision == 0:
-                        self.view = 0
+                        self.change_view(0)
 
                 else:
                     if mouse_collision == 0:
@@ -209,27 +163,15 @@ class Game:
             else:
                 self.pressed = False
 
-            self.to_render.append([
-                {
-                    "type": "surface",
-                    "surface": mv_button,
-                    "dest": self.elements["wm.mv.loc"]
-                }
-            ])
+            self.nodes["wm.mv"].surface = mv_button
 
         elif self.view == 2:
             # market
             pass
         elif self.view == 3:
             # virus info
-            buttons = (
-                self.elements["v.buttons.mv"],
-            )
-
             mv_button = self.elements["v.mv"]
 
-            mouse_collision = mouse_pos.collidelist(buttons)
-
             if mouse_collision > -1:
 
                 if mouse_state[0] == 1:
@@ -240,7 +182,7 @@ class Game:
                 elif mouse_state[0] == 0 and self.pressed is True:
                     self.pressed = False
                     if mouse_collision == 0:
-                        self.view = 0
+                        self.change_view(0)
 
                 else:
                     if mouse_collision == 0:
@@ -249,70 +191,16 @@ class Game:
             else:
                 self.pressed = False
 
-            self.to_render.append([
-                {
-                    "type": "surface",
-                    "surface": mv_button,
-                    "dest": self.elements["wm.v.loc"]
-                }
-            ])
+            self.nodes["vi.mv"].surface = mv_button
+
         elif self.view == 4:
             # virus creation
-
-            # player blocks
-
-            num_of_blocks = len(self.player_blocks)
-            total_card_height = (num_of_blocks + 1) * self.elements["vc.block.dy"]
-            pb_buttons = []
-
-            for num, player_block in enumerate(self.player_blocks):
-                self.to_render.append([
-                    {
-                        "type": "surface",
-                        "surface": player_block.graphic.card,
-                        "dest": (
-                            self.elements["vc.player_block.x"],
-                            self.elements["vc.block.y"] + num * self.elements["vc.block.dy"])
-                    }
-                ])
-                pb_buttons.append(
-                    player_block.graphic.card.get_rect(
-                        x=self.elements["vc.player_block.x"],
-                        y=self.elements["vc.block.y"] + num * self.elements["vc.block.dy"]
-                    )
-                )
-
-            # virus blocks
-
-            num_of_blocks = len(self.viruses[self.selected].blocks)
-            total_card_height = (num_of_blocks + 1) * self.elements["vc.block.dy"]
-            vb_buttons = []
-
-            for num, virus_block in enumerate(self.viruses[self.selected].blocks):
-                self.to_render.append([
-                    {
-                        "type": "surface",
-                        "surface": virus_block.graphic.card,
-                        "dest": (
-                            self.elements["vc.virus_block.x"],
-                            self.elements["vc.block.y"] + num * self.elements["vc.block.dy"])
-                    }
-                ])
-                vb_buttons.append(
-                    virus_block.graphic.card.get_rect(
-                        x=self.elements["vc.virus_block.x"],
-                        y=self.elements["vc.block.y"] + num * self.elements["vc.block.dy"]
-                    )
-                )
-
-            buttons = [
-                self.elements["v.buttons.mv"],
-            ]
+            # the main view button, player blocks are numbered after it, then the virus's blocks
+            num_of_buttons = 1
+            player_blocks = len(self.player_blocks)
 
             mv_button = self.elements["v.mv"]
 
-            mouse_collision = mouse_pos.collidelist(buttons + pb_buttons + vb_buttons)
-
             if mouse_collision > -1:
 
                 if mouse_state[0] == 1:
@@ -323,19 +211,21 @@ class Game:
                 elif mouse_state[0] == 0 and self.pressed is True:
                     self.pressed = False
                     if mouse_collision == 0:
-                        self.view = 0
                         self.viruses[self.selected].update_stats()
+                        self.change_view(0)
 
-                    elif mouse_collision > len(buttons + pb_buttons) - 1:
-                        block_collision = mouse_collision - len(buttons + pb_buttons)
+                    elif mouse_collision > num_of_buttons + player_blocks - 1:
+                        block_collision = mouse_collision - num_of_buttons - player_blocks
                         self.player_blocks.append(
                             self.viruses[self.selected].blocks.pop(block_collision)
                         )
-                    elif mouse_collision > len(buttons) - 1:
-                        block_collision = mouse_collision - len(buttons)
+                        self._layout_virus_creation()
+                    elif mouse_collision > num_of_buttons - 1:
+                        block_collision = mouse_collision - num_of_buttons
                         self.viruses[self.selected].blocks.append(
                             self.player_blocks.pop(block_collision)
                         )
+                        self._layout_virus_creation()
 
                 else:
                     if mouse_collision == 0:
@@ -344,22 +234,206 @@ class Game:
             else:
                 self.pressed = False
 
-            self.to_render.append([
-                {
-                    "type": "surface",
-                    "surface": mv_button,
-                    "dest": self.elements["v.mv.loc"]
-                }, {
-                    "type": "surface",
-                    "surface": self.elements["vc.infobar"],
-                    "dest": self.elements["vc.infobar.loc"]
-                }
-            ])
+            self.nodes["vc.mv"].surface = mv_button
         else:
             log.error("view was set to an invalid value resetting")
-            self.view = 0
+            self.change_view(0)
+
+        self.graphics.update(self.scenes[self.view])
+
+    def _build_scenes(self):
+        """ creates the scene of every view from self.elements, called on resolution changes """
+        background = (0, 0, 0)
+        self.nodes = {}
+
+        # main view
+        main_view = Scene("background", "cards", "buttons")
+        main_view.add(Fill(background), "background")
+        main_view.add(Blit(self.elements["mv.tray"], self.elements["mv.tray.loc"]), "background")
+        for name in ("mv.up", "mv.down", "mv.wm"):
+            self.nodes[name] = main_view.add(
+                Blit(self.elements[name], self.elements[name + ".loc"]), "buttons"
+            )
 
-        self.graphics.update(self.to_render)
+        # world map
+        world_map = Scene("background", "map", "overlays", "buttons")
+        world_map.add(Fill(background), "background")
+        self.nodes["wm.mv"] = world_map.add(
+            Blit(self.elements["wm.mv"], self.elements["wm.mv.loc"]), "buttons"
+        )
+
+        # market
+        market = Scene("background")
+        market.add(Fill(background), "background")
+
+        # virus info
+        virus_info = Scene("background", "buttons")
+        virus_info.add(Fill(background), "background")
+        self.nodes["vi.mv"] = virus_info.add(
+            Blit(self.elements["v.mv"], self.elements["v.mv.loc"]), "buttons"
+        )
+
+        # virus creation
+        virus_creation = Scene("background", "blocks", "buttons")
+        virus_creation.add(Fill(background), "background")
+        self.nodes["vc.mv"] = virus_creation.add(
+            Blit(self.elements["v.mv"], self.elements["v.mv.loc"]), "buttons"
+        )
+        virus_creation.add(
+            Blit(self.elements["vc.infobar"], self.elements["vc.infobar.loc"]), "buttons"
+        )
+
+        self.scenes = {
+            0: main_view, 1: world_map, 2: market, 3: virus_info, 4: virus_creation
+        }
+
+        # card lists
+        self.virus_list = VirtualList(
+            main_view, "cards", self._virus_card, self.elements["mv.card.x"], 0,
+            self.elements["mv.card.dy"], self.resolution[1], scroll=self.main_view_scroll
+        )
+        self.player_block_list = VirtualList(
+            virus_creation, "blocks", lambda num: self.player_blocks[num].graphic.card,
+            self.elements["vc.player_block.x"], self.elements["vc.block.y"],
+            self.elements["vc.block.dy"], self.resolution[1]
+        )
+        self.virus_block_list = VirtualList(
+            virus_creation, "blocks",
+            lambda num: self.viruses[self.selected].blocks[num].graphic.card,
+            self.elements["vc.virus_block.x"], self.elements["vc.block.y"],
+            self.elements["vc.block.dy"], self.resolution[1]
+        )
+
+        # hit indexes, each is built with the view's buttons in numbering order and its lists
+        resolution = self.resolution
+        main_view_hits = HitIndex()
+        card_x = self.elements["mv.card.x"]
+        main_view_hits.add((card_x, 0, resolution[0] - card_x, resolution[1]), self.virus_list)
+        for num, name in enumerate(("mv.buttons.up", "mv.buttons.down", "mv.buttons.wm")):
+            main_view_hits.add(self.elements[name], num)
+
+        world_map_hits = HitIndex()
+        world_map_hits.add(self.elements["wm.buttons.mv"], 0)
+
+        virus_info_hits = HitIndex()
+        virus_info_hits.add(self.elements["v.buttons.mv"], 0)
+
+        player_x = self.elements["vc.player_block.x"]
+        virus_x = self.elements["vc.virus_block.x"]
+        virus_creation_hits = HitIndex()
+        virus_creation_hits.add(
+            (player_x, 0, virus_x - player_x, resolution[1]), self.player_block_list
+        )
+        virus_creation_hits.add(
+            (virus_x, 0, resolution[0] - virus_x, resolution[1]), self.virus_block_list
+        )
+        virus_creation_hits.add(self.elements["v.buttons.mv"], 0)
+
+        self.hit_indexes = {
+            0: (main_view_hits, [self.virus_list]),
+            1: (world_map_hits, []),
+            2: (HitIndex(), []),
+            3: (virus_info_hits, []),
+            4: (virus_creation_hits, [self.player_block_list, self.virus_block_list])
+        }
+
+        self._layout_main_view()
+        if self.view == 1:
+            self.refresh_world_map()
+        elif self.view == 4:
+            self._layout_virus_creation()
+
+    def refresh_world_map(self):
+        """ updates the world map's regions after a turn, only changed regions are redrawn
+
+        the map is added to the world map scene here, the first time it is shown at a resolution,
+        so resizing while another view is shown doesn't draw it at every size
+        """
+        scene = self.scenes[1]
+        if self.world_map.scene is not scene:
+            # the map fills the space left of the main view button
+            self.world_map.attach(
+                scene, (0, 0, self.elements["wm.buttons.mv"].x, self.resolution[1])
+            )
+        self.world_map.refresh(
+            [virus.infection for virus in self.viruses if virus.released]
+        )
+
+    def _collision(self, point):
+        """ number of the widget under point in the current view, -1 if there is none
+
+        buttons are numbered as they were indexed, the rows of the view's card lists follow
+        them, one list after another
+        """
+        hits, lists = self.hit_indexes[self.view]
+        widget = hits.hit(point)
+        if widget is None:
+            return -1
+        if not isinstance(widget, VirtualList):
+            return widget
+        row = widget.hit(point)
+        if row == -1:
+            return -1
+        number = len(hits) - len(lists)
+        for card_list in lists:
+            if card_list is widget:
+                break
+            number += card_list.length
+        return number + row
+
+    def _virus_card(self, num):
+        """ card of virus num, or the new virus card after the last virus """
+        if num < len(self.viruses):
+            return self.viruses[num].graphic.card
+        return self.elements["mv.card.new"]
+
+    def _layout_main_view(self):
+        """ shows the cards of the viruses and the new virus card at the current scroll """
+        self.virus_list.layout(len(self.viruses) + 1, self.main_view_scroll)
+
+    def _layout_virus_creation(self):
+        """ shows the player's blocks and the selected virus's blocks """
+        self.player_block_list.layout(len(self.player_blocks))
+        self.virus_block_list.layout(len(self.viruses[self.selected].blocks))
+
+    # colours of the game's elements, the same at every resolution
+    COLOURS = {
+        "button": (150, 150, 150),
+        "button_hover": (125, 125, 125),
+        "button_pressed": (100, 100, 100),
+        "tray": (50, 50, 50),
+        "scroll": (75, 75, 75),
+
+        "outline": (200, 200, 200),
+        "internal": (75, 75, 75),
+        "text": (255, 255, 255)
+    }
+
+    def _element(self, name, size, draw):
+        """ the surface draw() makes for an element of size, drawn again only when its size does
+
+        elements come from the surface cache keyed by name and size, so a resize only redraws the
+        elements whose size it changed, and returning to an earlier size redraws none
+        """
+        return self.graphics.cache.get(("game element", name, tuple(size)), draw)
+
+    def _buttons(self, name, size, icon=None):
+        """ sets the name, name.hover and name.pressed elements to buttons of size with the
+        image called icon scaled to their width in their centre
+        """
+        for state, colour in (("", "button"), (".hover", "button_hover"),
+                              (".pressed", "button_pressed")):
+            def draw(colour=colour):
+                button = pygame.Surface(size)
+                button.fill(self.COLOURS[colour])
+                if icon is not None:
+                    image = self.graphics.cache.scale(
+                        self.graphics.images[icon], (size[0], size[0])
+                    )
+                    button.blit(image, image.get_rect(center=(size[0] // 2, size[1] // 2)))
+                return button
+
+            self.elements[name + state] = self._element((name, colour, icon), size, draw)
 
     def resolution_change(self, resolution):
         """ updates graphical game elements for a new resolution """
@@ -372,19 +446,7 @@ class Game:
         vc: virus creation
         v: virus info/creation
         """
-        # colours
-        colours = {
-            "button": (150, 150, 150),
-            "button_hover": (125, 125, 125),
-            "button_pressed": (100, 100, 100),
-            "tray": (50, 50, 50),
-            "scroll": (75, 75, 75),
-
-            "outline": (200, 200, 200),
-            "internal": (75, 75, 75),
-            "text": (255, 255, 255)
-        }
-
+        colours = self.COLOURS
         self.resolution = resolution
 
         # viruses
@@ -397,55 +459,30 @@ class Game:
         # main view
 
         # button to world map
-        # button width
         button_width = (resolution[0]//15)
-        button = pygame.Surface((button_width, resolution[1]))
-        button.fill(colours["button"])
-
-        button_icon = self.graphics.images["world icon"]
-        button_icon = pygame.transform.scale(button_icon, (button_width, button_width))
-
-        # find button centre
-        button_centre = button_icon.get_rect(center=(button.get_width()//2, button.get_height()//2))
-
-        button.blit(button_icon, button_centre)
-        self.elements["mv.wm"] = button.copy()
-
-        button.fill(colours["button_hover"])
-        button.blit(button_icon, button_centre)
-        self.elements["mv.wm.hover"] = button.copy()
-
-        button.fill(colours["button_pressed"])
-        button.blit(button_icon, button_centre)
-        self.elements["mv.wm.pressed"] = button
-
+        self._buttons("mv.wm", (button_width, resolution[1]), "world icon")
         self.elements["mv.wm.loc"] = (0, 0)
-        self.elements["mv.buttons.wm"] = button.get_rect()
+        self.elements["mv.buttons.wm"] = pygame.Rect(0, 0, button_width, resolution[1])
 
         # virus tray
         virus_tray_width = resolution[0]//5
         virus_scroll_width = resolution[0]//40
 
-        tray = pygame.Surface((virus_scroll_width + virus_tray_width, resolution[1]))
-
-        scroll_bar = pygame.Rect(0, 0, virus_scroll_width, resolution[1])
-        virus_select = pygame.Rect(virus_scroll_width, 0, virus_tray_width, resolution[1])
-
-        pygame.draw.rect(tray, colours["scroll"], scroll_bar)
-        pygame.draw.rect(tray, colours["tray"], virus_select)
+        def tray():
+            surface = pygame.Surface((virus_scroll_width + virus_tray_width, resolution[1]))
+            scroll_bar = pygame.Rect(0, 0, virus_scroll_width, resolution[1])
+            virus_select = pygame.Rect(virus_scroll_width, 0, virus_tray_width, resolution[1])
+            pygame.draw.rect(surface, colours["scroll"], scroll_bar)
+            pygame.draw.rect(surface, colours["tray"], virus_select)
+            return surface
 
-        self.elements["mv.tray"] = tray
+        self.elements["mv.tray"] = self._element(
+            "mv.tray", (virus_scroll_width + virus_tray_width, resolution[1]), tray
+        )
         self.elements["mv.tray.loc"] = (resolution[0] - virus_tray_width - virus_scroll_width, 0)
 
-        # up scroll arrow
-        top_scroll_arrow = pygame.Surface((virus_scroll_width, virus_scroll_width))
-
-        top_scroll_arrow.fill(colours["button"])
-        self.elements["mv.up"] = top_scroll_arrow.copy()
-        top_scroll_arrow.fill(colours["button_hover"])
-        self.elements["mv.up.hover"] = top_scroll_arrow.copy()
-        top_scroll_arrow.fill(colours["button_pressed"])
-        self.elements["mv.up.pressed"] = top_scroll_arrow
+        # scroll arrows, their size only depends on the width
+        self._buttons("mv.up", (virus_scroll_width, virus_scroll_width))
         self.elements["mv.up.loc"] = (
             resolution[0] - virus_tray_width - virus_scroll_width,
             0
@@ -455,15 +492,7 @@ class Game:
             (virus_scroll_width, virus_scroll_width)
         )
 
-        # down scroll arrow
-        bottom_scroll_arrow = pygame.Surface((virus_scroll_width, virus_scroll_width))
-
-        bottom_scroll_arrow.fill(colours["button"])
-        self.elements["mv.down"] = bottom_scroll_arrow.copy()
-        bottom_scroll_arrow.fill(colours["button_hover"])
-        self.elements["mv.down.hover"] = bottom_scroll_arrow.copy()
-        bottom_scroll_arrow.fill(colours["button_pressed"])
-        self.elements["mv.down.pressed"] = bottom_scroll_arrow
+        self._buttons("mv.down", (virus_scroll_width, virus_scroll_width))
         self.elements["mv.down.loc"] = (
             resolution[0] - virus_tray_width - virus_scroll_width,
             resolution[1] - virus_scroll_width
@@ -474,20 +503,23 @@ class Game:
         )
 
         # create new virus card
+        def new_virus_card():
+            card = pygame.Surface((900, 300))
+            card.fill(colours["outline"])
+            internal_bg = pygame.Rect(25, 25, 850, 250)
 
-        self.elements["mv.card.new"] = pygame.Surface((900, 300))
-        self.elements["mv.card.new"].fill(colours["outline"])
-        internal_bg = pygame.Rect(25, 25, 850, 250)
+            name_text = self.graphics.cache.text(
+                self.graphics.fonts["main"], "Create new virus", 60, colours["text"]
+            )
 
-        name_text = self.graphics.fonts["main"].render("Create new virus", colours["text"], size=60)
+            pygame.draw.rect(card, colours["internal"], internal_bg)
 
-        pygame.draw.rect(self.elements["mv.card.new"], colours["internal"], internal_bg)
+            card.blit(name_text, (40, 40))
 
-        self.elements["mv.card.new"].blit(name_text[0], (40, 40))
+            return pygame.transform.scale(card, (resolution[0] // 5, resolution[0] // 15))
 
-        self.elements["mv.card.new"] = pygame.transform.scale(
-            self.elements["mv.card.new"],
-            (resolution[0] // 5, resolution[0] // 15)
+        self.elements["mv.card.new"] = self._element(
+            "mv.card.new", (resolution[0] // 5, resolution[0] // 15), new_virus_card
         )
 
         self.elements["mv.card.x"] = resolution[0] - virus_tray_width
@@ -496,29 +528,8 @@ class Game:
         # world view
 
         # button to main view
-        # button width
         button_width = (resolution[0] // 15)
-        button = pygame.Surface((button_width, resolution[1]))
-        button.fill(colours["button"])
-
-        button_icon = self.graphics.images["right arrow"]
-        button_icon = pygame.transform.scale(button_icon, (button_width, button_width))
-
-        # find button centre
-        button_centre = button_icon.get_rect(
-            center=(button.get_width() // 2, button.get_height() // 2))
-
-        button.blit(button_icon, button_centre)
-        self.elements["wm.mv"] = button.copy()
-
-        button.fill(colours["button_hover"])
-        button.blit(button_icon, button_centre)
-        self.elements["wm.mv.hover"] = button.copy()
-
-        button.fill(colours["button_pressed"])
-        button.blit(button_icon, button_centre)
-        self.elements["wm.mv.pressed"] = button
-
+        self._buttons("wm.mv", (button_width, resolution[1]), "right arrow")
         self.elements["wm.mv.loc"] = (resolution[0] - button_width, 0)
         self.elements["wm.buttons.mv"] = pygame.Rect(
             self.elements["wm.mv.loc"],
@@ -528,29 +539,8 @@ class Game:
         # virus info/creation
 
         # button to main view
-        # button width
         button_width = (resolution[0] // 15)
-        button = pygame.Surface((button_width, resolution[1]))
-        button.fill(colours["button"])
-
-        button_icon = self.graphics.images["left arrow"]
-        button_icon = pygame.transform.scale(button_icon, (button_width, button_width))
-
-        # find button centre
-        button_centre = button_icon.get_rect(
-            center=(button.get_width() // 2, button.get_height() // 2))
-
-        button.blit(button_icon, button_centre)
-        self.elements["v.mv"] = button.copy()
-
-        button.fill(colours["button_hover"])
-        button.blit(button_icon, button_centre)
-        self.elements["v.mv.hover"] = button.copy()
-
-        button.fill(colours["button_pressed"])
-        button.blit(button_icon, button_centre)
-        self.elements["v.mv.pressed"] = button
-
+        self._buttons("v.mv", (button_width, resolution[1]), "left arrow")
         self.elements["v.mv.loc"] = (0, 0)
         self.elements["v.buttons.mv"] = pygame.Rect(
             self.elements["v.mv.loc"],
@@ -565,17 +555,22 @@ class Game:
         self.elements["vc.block.dy"] = int(resolution[0]*0.016)
         self.elements["vc.block.y"] = self.elements["vc.block.dy"] * 2
 
-        self.elements["vc.infobar"] = pygame.Surface(
-            (resolution[0] - sidebar_x, int(resolution[1]*0.1))
-        )
-        self.elements["vc.infobar"].fill(colours["outline"])
-        self.elements["vc.infobar.loc"] = (sidebar_x, int(resolution[1]*0.9))
+        infobar_size = (resolution[0] - sidebar_x, int(resolution[1]*0.1))
 
+        def infobar():
+            surface = pygame.Surface(infobar_size)
+            surface.fill(colours["outline"])
+            return surface
 
-        release_text = self.graphics.fonts["main"].render("Release!")
+        self.elements["vc.infobar"] = self._element("vc.infobar", infobar_size, infobar)
+        self.elements["vc.infobar.loc"] = (sidebar_x, int(resolution[1]*0.9))
 
         self.elements["vc.release"] = pygame.Surface((resolution[0]//20, resolution[1]//20))
 
+        # the scenes only hold nodes pointing at the elements, so they are made again rather
+        # than every node being moved
+        self._build_scenes()
+
 
 def main():
     earth = World()
@@ -587,7 +582,8 @@ def main():
             Virus(
                 10, 50, 70,
                 industry=INDUSTRIES.index('Chemical Manufacturing'),
-                start_region=earth.regions['West Europe'])
+                start_region=earth.regions['West Europe']),
+            events=ConsoleSink()
         )
         input(f'Earth population is now {earth.population}. Press any key + enter to continue')
         if earth.population == 0:
@@ -2,6 +2,9 @@ import logging
 
 import pygame
 import pygame.freetype
+from src.assets import Assets
+from src.scene import Scene
+from src.surface_cache import SurfaceCache
 
 # gets logger
 log = logging.getLogger("main.graphics")
@@ -9,13 +12,32 @@ log.setLevel(logging.INFO)
 log.info("graphics logging initialised")
 
 
-class Graphics:
+class Images(dict):
+    """ dict of image names to surfaces that loads each image when it is first looked up """
+
+    def __init__(self, assets, paths):
+        super(Images, self).__init__()
+        self.assets = assets
+        self.paths = paths
+
+    def __missing__(self, name):
+        image = self[name] = self.assets.image(self.paths[name])
+        return image
 
-    def __init__(self):
 
-        pygame_initialisation = pygame.init()
+class Graphics:
+
+    def __init__(self, dirty_rects=True):
+        # when True only the changed parts of each frame are redrawn, see update
+        self.dirty_rects = dirty_rects
+        self.previous_scene = None
+        self.previous_size = None
 
-        if pygame_initialisation == (8, 0):
+        # only the subsystems the game uses are started, pygame.init starts them all which is
+        # slow on some platforms
+        pygame.display.init()
+        pygame.freetype.init()
+        if pygame.display.get_init() and pygame.freetype.get_init():
             log.info("PyGame Initialised")
         else:
             log.critical(
@@ -32,42 +54,44 @@ class Graphics:
             20
         )}
 
-        log.info("loading images")
-        self.images = {
-            "example": pygame.image.load("assets/images/" + "example.jpg"),
-            "world icon": pygame.image.load("assets/images/" + "world.png"),
-            "right arrow": pygame.image.load("assets/images/" + "right-arrow.png"),
-            "left arrow": pygame.image.load("assets/images/" + "left-arrow.png"),
-            "up arrow": pygame.image.load("assets/images/" + "up-arrow.png"),
-            "down arrow": pygame.image.load("assets/images/" + "down-arrow.png")
-        }
-
-    def update(self, to_render: list) -> None:
-        """ to_render is a list of elements to render in order"""
-        for obj in to_render:
-            log.debug("rendering: " + str(obj))
-            for element in obj:
-                if element["type"] == "image":
-                    # draws a loaded image onto the display
-                    self.display.blit(self.images[element["image"]], element["dest"])
-
-                elif element["type"] == "rect":
-                    if "edge_width" in element:
-                        pygame.draw.rect(
-                            self.display,
-                            element["colour"],
-                            element["rect"],
-                            element["edge_width"]
-                        )
-                    else:
-                        # fill is used over .draw.rect as it can be faster
-                        self.display.fill(element["colour"], element["rect"])
-
-                elif element["type"] == "surface":
-                    # draw a surface onto the display
-                    self.display.blit(element["surface"], element["dest"])
-
-                elif element["type"] == "bg":
-                    # fill the entire display with a colour
-                    self.display.fill(element["colour"])
-        pygame.display.update()
+        # images are loaded the first time they are used
+        self.assets = Assets()
+        self.images = Images(self.assets, {
+            "example": "assets/images/" + "example.jpg",
+            "world icon": "assets/images/" + "world.png",
+            "right arrow": "assets/images/" + "right-arrow.png",
+            "left arrow": "assets/images/" + "left-arrow.png",
+            "up arrow": "assets/images/" + "up-arrow.png",
+            "down arrow": "assets/images/" + "down-arrow.png"
+        })
+
+        # rendered text and scaled images shared by every view
+        self.cache = SurfaceCache()
+
+    def invalidate(self) -> None:
+        """ forces the next update to redraw the whole display """
+        self.previous_scene = None
+
+    def update(self, scene: Scene) -> None:
+        """ draws a Scene to the display
+
+        the whole scene is drawn when it differs from the previous frame's scene, the display
+        size changed or dirty rect mode is off. otherwise only the areas of nodes that changed or
+        were removed since the last frame are redrawn, clipped, and sent to the display, so an
+        unchanged scene costs nothing.
+        """
+        display = pygame.display.get_surface()
+        self.display = display
+        size = display.get_size()
+
+        if (not self.dirty_rects or scene.redraw or scene is not self.previous_scene
+                or size != self.previous_size):
+            scene.draw(display)
+            pygame.display.update()
+
+        elif scene.dirty or scene.removed:
+            pygame.display.update(scene.draw_dirty(display))
+
+        scene.finish_frame()
+        self.previous_scene = scene
+        self.previous_size = size
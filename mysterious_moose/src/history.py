@@ -0,0 +1,126 @@
+import csv
+
+import numpy
+
+# per turn world values, in the order they are exported
+WORLD_COLUMNS = ("co2_concentration", "sea_level", "temperature_rise")
+
+
+class History:
+    """ turn by turn record of a world, one row of each array per recorded turn
+
+    rows are written into preallocated arrays, doubled in length when they fill up, so recording
+    a turn is a few array copies however many regions there are, and a long game costs a handful
+    of reallocations rather than an object per region per turn. the arrays are exported in bulk
+    with save (.npz) or write_csv.
+    """
+
+    def __init__(self, world, capacity=256):
+        self.names = [region.name for region in world.region_list]
+        self._length = 0
+        self._allocate(max(1, capacity))
+
+    def _allocate(self, capacity):
+        size = len(self.names)
+        columns = {
+            "_populations": numpy.zeros((capacity, size), dtype=numpy.int64),
+            # number of viruses infecting each region
+            "_infected": numpy.zeros((capacity, size), dtype=numpy.uint8),
+            **{"_" + name: numpy.zeros(capacity, dtype=numpy.float64) for name in WORLD_COLUMNS}
+        }
+        for name, column in columns.items():
+            if self._length:
+                column[:self._length] = getattr(self, name)[:self._length]
+            setattr(self, name, column)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self._length
+
+    def clear(self):
+        """ forgets every recorded turn, keeping the arrays for the next game """
+        self._length = 0
+
+    def record(self, world, infections=()):
+        """ appends the world's current state, infections are the Infection sets of its viruses """
+        if self._length == self.capacity:
+            self._allocate(self.capacity * 2)
+        row = self._length
+        self._populations[row] = world.populations
+        infected = self._infected[row]
+        infected[:] = 0
+        for infection in infections:
+            infected += infection.infected
+        for name in WORLD_COLUMNS:
+            getattr(self, "_" + name)[row] = getattr(world, name)
+        self._length += 1
+
+    @property
+    def populations(self):
+        """ (turns, regions) array of region populations """
+        return self._populations[:self._length]
+
+    @property
+    def infected(self):
+        """ (turns, regions) array of how many viruses infect each region """
+        return self._infected[:self._length]
+
+    @property
+    def co2_concentration(self):
+        return self._co2_concentration[:self._length]
+
+    @property
+    def sea_level(self):
+        return self._sea_level[:self._length]
+
+    @property
+    def temperature_rise(self):
+        return self._temperature_rise[:self._length]
+
+    def save(self, path):
+        """ writes the recorded turns to a compressed .npz file, which load reads back """
+        numpy.savez_compressed(
+            path,
+            regions=numpy.array(self.names),
+            populations=self.populations,
+            infected=self.infected,
+            **{name: getattr(self, name) for name in WORLD_COLUMNS}
+        )
+
+    @classmethod
+    def load(cls, path):
+        """ a History of the turns saved in the .npz file at path """
+        with numpy.load(path) as arrays:
+            history = cls.__new__(cls)
+            history.names = arrays["regions"].tolist()
+            history._length = 0
+            # room for at least one more turn, so recording onto it can grow by doubling
+            history._allocate(max(len(arrays["populations"]), 1))
+            history._length = len(arrays["populations"])
+            history._populations[:history._length] = arrays["populations"]
+            history._infected[:history._length] = arrays["infected"]
+            for name in WORLD_COLUMNS:
+                getattr(history, "_" + name)[:history._length] = arrays[name]
+        return history
+
+    def write_csv(self, path):
+        """ writes the recorded turns as csv, a row per turn with the world values then a
+        population and an infected column per region
+        """
+        with open(path, "w", newline="") as csv_file:
+            csv.writer(csv_file).writerow(
+                ["turn", *WORLD_COLUMNS]
+                + [name + " population" for name in self.names]
+                + [name + " infected" for name in self.names]
+            )
+            rows = numpy.column_stack([
+                numpy.arange(self._length),
+                *(getattr(self, name) for name in WORLD_COLUMNS),
+                self.populations,
+                self.infected
+            ])
+            size = len(self.names)
+            numpy.savetxt(
+                csv_file, rows, delimiter=",",
+                fmt=["%d"] + ["%.17g"] * len(WORLD_COLUMNS) + ["%d"] * (2 * size)
+            )
@@ -0,0 +1,145 @@
+import numpy
+
+
+class Infection:
+    """ the regions of one world a virus affects
+
+    infected regions are kept both as an insertion ordered {region id: Region} dict and as a
+    boolean mask over region ids, so membership, adding and removing are all O(1) lookups.
+
+    alongside the mask, per target region totals are kept over every infected source: how many
+    sources can reach it, how many are certain to infect it and the summed log chance of the rest
+    failing. a source infects a target when spread beats a draw from randint(0, distance), so the
+    chance a target is infected in a turn is 1 - the product of every source failing. the totals
+    are updated by one vectorised pass over a source's route row when it is added or removed,
+    leaving each turn's work proportional to the frontier and the number of infections that
+    changed, not to infected regions x all regions.
+    """
+
+    def __init__(self, world, regions=()):
+        self.world = world
+        size = len(world.region_list)
+        self.regions = {}
+        self.infected = numpy.zeros(size, dtype=bool)
+
+        # virulence * VIRULENCE_FACTOR and route table the totals were calculated for,
+        # None until prepare is called
+        self.spread = None
+        self._routes = None
+        self._reach = numpy.zeros(size, dtype=numpy.int32)
+        self._certain = numpy.zeros(size, dtype=numpy.int32)
+        self._log_escape = numpy.zeros(size, dtype=numpy.float64)
+
+        for region in regions:
+            self.add(region)
+
+    def __len__(self):
+        return len(self.regions)
+
+    def __iter__(self):
+        return iter(list(self.regions.values()))
+
+    def __contains__(self, region):
+        return region.id in self.regions
+
+    def _update_totals(self, region_id, sign):
+        """ adds (sign 1) or removes (sign -1) a source's contribution to the totals """
+        distances = numpy.frombuffer(self._routes.row(region_id), dtype=numpy.intc)
+        reachable = distances >= 0
+        # number of draws from randint(0, distance) below spread, out of distance + 1
+        winning = max(numpy.ceil(self.spread), 0)
+        outcomes = distances + 1
+        certain = reachable & (winning >= outcomes)
+        partial = reachable & ~certain & (winning > 0)
+
+        self._reach += sign * (certain | partial)
+        self._certain += sign * certain
+        self._log_escape[partial] += sign * numpy.log1p(-winning / outcomes[partial])
+
+    def prepare(self, spread):
+        """ sets the spread threshold, recalculating the totals if it or the world's routes changed
+        """
+        if spread == self.spread and self.world.routes is self._routes:
+            return
+        self.spread = spread
+        self._routes = self.world.routes
+        self._reach[:] = 0
+        self._certain[:] = 0
+        self._log_escape[:] = 0
+        for region_id in self.regions:
+            self._update_totals(region_id, 1)
+
+    def add(self, region):
+        """ infects a region, returns False if it was already infected """
+        if region.id in self.regions:
+            return False
+        self.regions[region.id] = region
+        self.infected[region.id] = True
+        if self.spread is not None:
+            self._update_totals(region.id, 1)
+        return True
+
+    def remove(self, region):
+        """ cures a region """
+        del self.regions[region.id]
+        self.infected[region.id] = False
+        if not self.regions:
+            # start again from exact zeros rather than carry rounding errors
+            self._reach[:] = 0
+            self._certain[:] = 0
+            self._log_escape[:] = 0
+        elif self.spread is not None:
+            self._update_totals(region.id, -1)
+
+    @property
+    def frontier(self):
+        """ ids of the uninfected, undestroyed regions an infected region can spread to """
+        return numpy.flatnonzero((self._reach > 0) & ~self.infected & ~self.world.destroyed)
+
+    def frontier_regions(self):
+        return [self.world.region_list[region_id] for region_id in self.frontier]
+
+    def probabilities(self, region_ids):
+        """ chance of each region being infected by at least one infected region this turn """
+        return numpy.where(
+            self._certain[region_ids] > 0, 1.0, -numpy.expm1(self._log_escape[region_ids])
+        )
+
+    def fork(self, world):
+        """ copy of the infection for a fork of its world """
+        infection = Infection.__new__(Infection)
+        infection.world = world
+        infection.regions = {
+            region_id: world.region_list[region_id] for region_id in self.regions
+        }
+        infection.infected = self.infected.copy()
+        infection.spread = self.spread
+        infection._routes = self._routes
+        infection._reach = self._reach.copy()
+        infection._certain = self._certain.copy()
+        infection._log_escape = self._log_escape.copy()
+        return infection
+
+
+def joint_frontier(infections):
+    """ the frontiers of several infections of one world, found together
+
+    returns (owners, region_ids, probabilities), with an entry for every frontier region of every
+    infection: the index of the infection in infections, the region's id and its chance of being
+    infected this turn. entries are ordered by infection then region id. every infection must
+    have been prepared
+    """
+    if not infections:
+        empty = numpy.zeros(0, dtype=numpy.intp)
+        return empty, empty, numpy.zeros(0)
+    destroyed = infections[0].world.destroyed
+    reach = numpy.stack([infection._reach for infection in infections])
+    infected = numpy.stack([infection.infected for infection in infections])
+    owners, region_ids = numpy.nonzero((reach > 0) & ~infected & ~destroyed)
+
+    certain = numpy.stack([infection._certain for infection in infections])[owners, region_ids]
+    log_escape = numpy.stack(
+        [infection._log_escape for infection in infections]
+    )[owners, region_ids]
+    probabilities = numpy.where(certain > 0, 1.0, -numpy.expm1(log_escape))
+    return owners, region_ids, probabilities
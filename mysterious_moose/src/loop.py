@@ -1,8 +1,8 @@
 import logging
 
 import pygame
-import src.game as game
 import src.menus as menus
+import src.scheduler as scheduler
 
 log = logging.getLogger("main.loop")
 log.setLevel(logging.INFO)
@@ -10,31 +10,64 @@ log.info("main loop logger initialised")
 
 
 class Main:
-    def __init__(self, graphics):
-        """ initialises the program main loop """
+    def __init__(self, graphics, fps=60, startup=None):
+        """ initialises the program main loop, fps is the frame rate cap while animating
+
+        startup is a scheduler.StartupTimer, finished once the first frame is drawn
+        """
         log.info("main loop initialising")
         self.state = 1
         self.exit_code = -1
         self.graphics = graphics
-        # menus - when adding anything before check whether it should
-        #         be in resolution_dependants as well
-        self.main_menu = menus.MainMenu(graphics)
-        self.options_menu = menus.Options(graphics)
-        self.game_setup_options = menus.GameSetupOptions(graphics)
-
-        # when the window resolution is changed this list is updated
-        self.resolution_dependants = [
-            self.main_menu, self.options_menu, self.game_setup_options
-        ]
+        self.scheduler = scheduler.FrameScheduler(fps)
+        self.startup = startup
+
+        self.resolution = pygame.display.get_surface().get_size()
+        # resolution each dependant was last laid out for, when the window resolution changes
+        # they are laid out again the next time they are shown, see _layout
+        self.resolution_dependants = {}
+        # menus, by class, created the first time they are shown
+        self.menus = {}
+
+    def _menu(self, menu_class):
+        """ the menu_class menu, created the first time it is asked for """
+        menu = self.menus.get(menu_class)
+        if menu is None:
+            log.info("creating " + menu_class.__name__)
+            menu = self.menus[menu_class] = menu_class(self.graphics)
+            self.resolution_dependants[menu] = self.resolution
+        return menu
+
+    @property
+    def main_menu(self):
+        return self._menu(menus.MainMenu)
+
+    @property
+    def options_menu(self):
+        return self._menu(menus.Options)
+
+    @property
+    def game_setup_options(self):
+        return self._menu(menus.GameSetupOptions)
 
     def _end(self):
         """ handles main loop completion """
+        log.info("frame report: " + str(self.scheduler.report()))
         exit(self.exit_code)
 
+    def _animating(self):
+        """ whether the current state needs frames when no events arrive """
+        # menus only change in response to events, the game is redrawn at the full frame rate
+        # the first frame is drawn straight away rather than after waiting for an event
+        if self.startup is not None and not self.startup.finished:
+            return True
+        return self.state == 4
+
     def _state(self):
         """ main code for loop """
         if self.state == 1:
             # main menu
+            self._layout(self.main_menu)
             mouse_events = self.main_menu.display()
 
             # events:
@@ -51,6 +84,7 @@ class Main:
 
         elif self.state == 2:
             # options
+            self._layout(self.options_menu)
             mouse_events = self.options_menu.display()
 
             # events: - (there are currently no events)
@@ -60,6 +94,7 @@ class Main:
 
         elif self.state == 3:
             # game setup
+            self._layout(self.game_setup_options)
             mouse_events = self.game_setup_options.display()
 
             # events: - (there are currently no events)
@@ -67,42 +102,63 @@ class Main:
             for event in mouse_events:
                 if event == "play":
                     log.info("Starting Game!")
+                    # imported here as the game and simulation are slow to import and aren't
+                    # needed until now
+                    import src.game as game
                     # initialise game
                     self.game = game.Game(self.graphics)
-                    self.resolution_dependants.append(self.game)
+                    self.resolution_dependants[self.game] = self.resolution
                     # transition to game state
                     self.state = 4
 
         elif self.state == 4:
             # game running
+            self._layout(self.game)
             self.game.update(self.events)
 
+    def _layout(self, dependant):
+        """ lays dependant out for the current resolution if it isn't already """
+        if self.resolution_dependants.get(dependant) != self.resolution:
+            self.resolution_dependants[dependant] = self.resolution
+            dependant.resolution_change(self.resolution)
+
+    def _resize(self, size):
+        """ resizes the display to size, dependants are laid out for it when next shown """
+        resolution = (
+            800 if size[0] < 800 else size[0],
+            600 if size[1] < 600 else size[1]
+        )
+        if pygame.display.get_surface().get_size() != resolution:
+            pygame.display.set_mode(resolution, pygame.RESIZABLE)
+            # the new display starts blank so everything must be redrawn
+            self.graphics.invalidate()
+        if resolution != self.resolution:
+            log.debug("resolution: " + str(resolution))
+            self.resolution = resolution
+
     def _repeat(self):
         """ main loop """
         while self.exit_code == -1:
             # executed every loop
-            pygame.event.pump()  # execute pygame background tasks
-            self.events = pygame.event.get()
+            # waits for the next frame, sleeping until an event arrives if nothing is animating
+            self.events = self.scheduler.next_frame(self._animating())
             log.debug("events: " + str(self.events))
+            resize = None
             for event in self.events:
                 if event.type == pygame.QUIT:
                     log.info("Quit event received")
                     self.exit_code = 0
                 elif event.type == pygame.VIDEORESIZE:
-                    # get the new display size
-                    resolution = (
-                        800 if event.w < 800 else event.w,
-                        600 if event.h < 600 else event.h
-                    )
-                    # update resolution
-                    pygame.display.set_mode(resolution, pygame.RESIZABLE)
-                    log.debug("resolution: " + str(resolution))
-
-                    for to_update in self.resolution_dependants:
-                        to_update.resolution_change(resolution)
+                    # dragging a window edge sends many of these, only the last is applied
+                    resize = (event.w, event.h)
+
+            if resize is not None:
+                self._resize(resize)
 
             # execute state dependant code
             self._state()
+            if self.startup is not None:
+                self.startup.finish()
 
         self._end()
 
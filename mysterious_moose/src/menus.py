@@ -1,6 +1,8 @@
 import logging
 
 import pygame
+from src.scene import Blit, Fill, Rect, Scene
+from src.widgets import HitIndex
 
 
 class Menu:
@@ -11,22 +13,33 @@ class Menu:
         self.button_click_colour = (100, 0, 50)
 
         self.intersects = dict()
+        # index of the intersects, giving each one's position in intersects
+        self.hits = HitIndex()
 
         # True if the mouse is currently pressed
         self.pressed = False
         self.renderer = renderer
 
+    def index_intersects(self):
+        """ rebuilds the hit index after intersects changes """
+        self.hits.clear()
+        for num, rect in enumerate(self.intersects.values()):
+            self.hits.add(rect, num)
+
+    def mouse_collision(self):
+        """ position in intersects of the button under the mouse, -1 if there is none """
+        collision = self.hits.hit(pygame.mouse.get_pos())
+        return -1 if collision is None else collision
+
 
 class MainMenu(Menu):
     def __init__(self, renderer):
         super(MainMenu, self).__init__(renderer)
         self.log = logging.getLogger("main.menu.MainMenu")
         self.log.setLevel(logging.INFO)
-        self.graphics = [[
-            {"type": "bg", "colour": (255, 255, 255)}
-        ],
-            []  # list edited by self.resolution_change()
-        ]
+        self.scene = Scene("background", "menu")
+        self.scene.add(Fill((255, 255, 255)), "background")
+        self.buttons = []  # button Rect nodes, in the same order as self.intersects
 
         # get resolution
         display_info = pygame.display.Info()
@@ -35,14 +48,11 @@ class MainMenu(Menu):
 
     def resolution_change(self, resolution):
 
-        # title
-        title = self.renderer.fonts["main"].render(
-            text="Anthropodemics",
-            size=1000
-        )
-        title_size = title[1][2:]
+        cache = self.renderer.cache
 
-        title = pygame.transform.scale(title[0], (
+        # title
+        title = cache.text(self.renderer.fonts["main"], "Anthropodemics", 1000)
+        title = cache.scale(title, (
             int(resolution[0]/1.25),
             int(resolution[0]*0.10428)
         ))
@@ -58,10 +68,7 @@ class MainMenu(Menu):
             resolution[0]//5,
             50
         )
-        play_text = self.renderer.fonts["main"].render(
-            text="Play",
-            size=40
-        )[0]
+        play_text = cache.text(self.renderer.fonts["main"], "Play", 40)
         play_text_pos = play_text.get_rect(center=(resolution[0]/2, title_size[1] + 65))
 
         # options
@@ -71,48 +78,37 @@ class MainMenu(Menu):
             resolution[0] // 5,
             50
         )
-        options_text = self.renderer.fonts["main"].render(
-            text="Options",
-            size=40
-        )[0]
+        options_text = cache.text(self.renderer.fonts["main"], "Options", 40)
         options_text_pos = options_text.get_rect(center=(resolution[0] / 2, title_size[1] + 125))
 
-        # puts elements in graphics to be rendered
-        self.graphics[1] = [
-            {"type": "surface", "surface": title, "dest": (resolution[0]//10, 20)},
-            {"type": "rect", "rect": play_button, "colour": self.button_colour},
-            {"type": "surface", "surface": play_text, "dest": play_text_pos},
-            {"type": "rect", "rect": options_button, "colour": self.button_colour},
-            {"type": "surface", "surface": options_text, "dest": options_text_pos}
-        ]
+        # puts elements in the scene to be rendered
+        self.scene.clear("menu")
+        self.scene.add(Blit(title, (resolution[0]//10, 20)), "menu")
+        play = self.scene.add(Rect(play_button, self.button_colour), "menu")
+        self.scene.add(Blit(play_text, play_text_pos), "menu")
+        options = self.scene.add(Rect(options_button, self.button_colour), "menu")
+        self.scene.add(Blit(options_text, options_text_pos), "menu")
+        self.buttons = [play, options]
+        self.scene.invalidate()
 
         # dict of intersects for the mouse
         self.intersects = {"play": play_button, "options": options_button}
+        self.index_intersects()
 
     def display(self):
         # create events list for output
         events = []
 
-        # make a copy of graphics for editing
-        graphics = self.graphics
-
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_pos = pygame.Rect(mouse_pos[0], mouse_pos[1], 1, 1)
         mouse_state = pygame.mouse.get_pressed()
 
-        # collidelist is used here rather than collidedict as collidedict doesn't appear to
-        # function. In the future, it would be nice to exchange them.
-        mouse_collision = mouse_pos.collidelist(list(self.intersects.values()))
+        mouse_collision = self.mouse_collision()
         self.log.debug("mouse collision value: " + str(mouse_collision))
         self.log.debug("mouse_state: " + str(mouse_state))
         if mouse_collision > -1:
             if mouse_state[0] == 1:
                 self.log.debug("pressed")
                 self.pressed = True
-                if mouse_collision == 0:
-                    self.graphics[1][1]["colour"] = self.button_click_colour
-                elif mouse_collision == 1:
-                    self.graphics[1][3]["colour"] = self.button_click_colour
+                self.buttons[mouse_collision].colour = self.button_click_colour
             elif mouse_state[0] == 0 and self.pressed is True:
                 self.log.debug("released")
                 self.pressed = False
@@ -121,16 +117,13 @@ class MainMenu(Menu):
                 elif mouse_collision == 1:
                     events.append("options")
             else:
-                if mouse_collision == 0:
-                    self.graphics[1][1]["colour"] = self.button_hover_colour
-                if mouse_collision == 1:
-                    self.graphics[1][3]["colour"] = self.button_hover_colour
+                self.buttons[mouse_collision].colour = self.button_hover_colour
         else:
             self.pressed = False
-            self.graphics[1][1]["colour"] = self.button_colour
-            self.graphics[1][3]["colour"] = self.button_colour
+            for button in self.buttons:
+                button.colour = self.button_colour
 
-        self.renderer.update(graphics)
+        self.renderer.update(self.scene)
         return events
 
 
@@ -139,9 +132,8 @@ class Options(Menu):
         super(Options, self).__init__(renderer)
         self.log = logging.getLogger("main.menu.OptionMenu")
         self.log.setLevel(logging.INFO)
-        self.graphics = [[
-            {"type": "bg", "colour": (255, 5, 255)}
-        ]]
+        self.scene = Scene("background")
+        self.scene.add(Fill((255, 5, 255)), "background")
 
         # get resolution
         display_info = pygame.display.Info()
@@ -154,7 +146,7 @@ class Options(Menu):
     def display(self):
         # create events list for output
         events = []
-        self.renderer.update(self.graphics)
+        self.renderer.update(self.scene)
         return events
 
 
@@ -163,11 +155,9 @@ class GameSetupOptions(Menu):
         super(GameSetupOptions, self).__init__(renderer)
         self.log = logging.getLogger("main.menu.GameSetupMenu")
         self.log.setLevel(logging.INFO)
-        self.graphics = [[
-            {"type": "bg", "colour": (255, 10, 255)},
-        ],
-            []  # used in self.resolution_change
-        ]
+        self.scene = Scene("background", "menu")
+        self.scene.add(Fill((255, 10, 255)), "background")
+        self.buttons = []  # button Rect nodes, in the same order as self.intersects
 
         # get resolution
         display_info = pygame.display.Info()
@@ -184,50 +174,43 @@ class GameSetupOptions(Menu):
             resolution[0]//5,
             50
         )
-        play_text = self.renderer.fonts["main"].render(
-            text="Play",
-            size=40
-        )[0]
+        play_text = self.renderer.cache.text(self.renderer.fonts["main"], "Play", 40)
         play_text_pos = play_text.get_rect(center=(resolution[0]/2, 65))
 
-        self.graphics[1] = [
-            {"type": "rect", "rect": play_button, "colour": self.button_colour},
-            {"type": "surface", "surface": play_text, "dest": play_text_pos}
-        ]
+        self.scene.clear("menu")
+        self.buttons = [self.scene.add(Rect(play_button, self.button_colour), "menu")]
+        self.scene.add(Blit(play_text, play_text_pos), "menu")
+        self.scene.invalidate()
 
         # dict of intersects for the mouse
         self.intersects = {"play": play_button}
+        self.index_intersects()
 
     def display(self):
         # create events list for output
         events = []
 
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_pos = pygame.Rect(mouse_pos[0], mouse_pos[1], 1, 1)
         mouse_state = pygame.mouse.get_pressed()
 
-        # collidelist is used here rather than collidedict as collidedict doesn't appear to
-        # function. In the future, it would be nice to exchange them.
-        mouse_collision = mouse_pos.collidelist(list(self.intersects.values()))
+        mouse_collision = self.mouse_collision()
         self.log.debug("mouse collision value: " + str(mouse_collision))
         self.log.debug("mouse_state: " + str(mouse_state))
         if mouse_collision > -1:
             if mouse_state[0] == 1:
                 self.log.debug("pressed")
                 self.pressed = True
-                if mouse_collision == 0:
-                    self.graphics[1][0]["colour"] = self.button_click_colour
+                self.buttons[mouse_collision].colour = self.button_click_colour
             elif mouse_state[0] == 0 and self.pressed is True:
                 self.log.debug("released")
                 self.pressed = False
                 if mouse_collision == 0:
                     events.append("play")
             else:
-                if mouse_collision == 0:
-                    self.graphics[1][0]["colour"] = self.button_hover_colour
+                self.buttons[mouse_collision].colour = self.button_hover_colour
         else:
             self.pressed = False
-            self.graphics[1][1]["colour"] = self.button_colour
+            for button in self.buttons:
+                button.colour = self.button_colour
 
-        self.renderer.update(self.graphics)
+        self.renderer.update(self.scene)
         return events
@@ -0,0 +1,81 @@
+import argparse
+import json
+import os
+
+import numpy
+
+# columns of a region table, the name field is sized to the longest name when a table is made
+COLUMNS = [("name", "U"), ("elevation", "<f8"), ("population", "<i8")]
+
+
+def make_table(names, elevations, populations):
+    """ a read only region table from its columns, region ids are the positions in them """
+    longest = max((len(name) for name in names), default=1)
+    dtype = numpy.dtype([
+        (name, kind + str(longest) if kind == "U" else kind) for name, kind in COLUMNS
+    ])
+    table = numpy.empty(len(names), dtype=dtype)
+    table["name"] = names
+    table["elevation"] = elevations
+    table["population"] = populations
+    table.setflags(write=False)
+    return table
+
+
+def read_tsv(path):
+    """ reads a tab separated name, elevation, population file into a read only region table """
+    names, elevations, populations = [], [], []
+    with open(path, 'r') as lines:
+        for line in lines:
+            split_line = line.rstrip("\n").split('\t')
+            names.append(split_line[0])
+            elevations.append(float(split_line[1]))
+            populations.append(int(split_line[2]))
+    return make_table(names, elevations, populations)
+
+
+def read_graph(path):
+    """ reads a json {name: {neighbour: distance}} region graph, as taken by World """
+    with open(path, 'r') as graph_file:
+        return json.load(graph_file)
+
+
+def write_graph(path, distances):
+    with open(path, 'w') as graph_file:
+        json.dump(distances, graph_file)
+
+
+def convert(tsv_path, npy_path):
+    """ writes the region table in tsv_path to npy_path, returns the table """
+    table = read_tsv(tsv_path)
+    numpy.save(npy_path, table)
+    return table
+
+
+def load(path):
+    """ the region table in path, a structured array with a row per region in id order
+
+    .npy tables (see convert) are memory mapped read only, so loading one doesn't read it and
+    every process loading the same file shares its pages. anything else is read as a tsv.
+    """
+    if os.path.splitext(path)[1] == ".npy":
+        return numpy.load(path, mmap_mode="r")
+    return read_tsv(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.region_data",
+        description="Converts a tab separated region file into a memory mappable .npy table."
+    )
+    parser.add_argument("tsv", nargs="?", default="data/regions.txt")
+    parser.add_argument("npy", nargs="?", help="output path (default: the tsv path with .npy)")
+    args = parser.parse_args(argv)
+
+    npy_path = args.npy or os.path.splitext(args.tsv)[0] + ".npy"
+    table = convert(args.tsv, npy_path)
+    print("wrote " + str(len(table)) + " regions to " + npy_path)
+
+
+if __name__ == "__main__":
+    main()
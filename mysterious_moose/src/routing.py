@@ -0,0 +1,217 @@
+import heapq
+from array import array
+
+import numpy
+
+# value stored in the tables for pairs of regions with no route between them
+UNREACHABLE = -1
+
+
+class RegionGraph:
+    """ weighted region graph in compressed sparse row form, indexed by region id
+
+    the links of region num are neighbours[offsets[num]:offsets[num + 1]], sorted by neighbour
+    id, with their distances at the same positions in weights. the arrays are read only, so a
+    graph can be shared between worlds and changing a link makes a new graph (see with_link).
+    """
+
+    def __init__(self, offsets, neighbours, weights):
+        self.offsets = offsets
+        self.neighbours = neighbours
+        self.weights = weights
+        for column in (offsets, neighbours, weights):
+            column.setflags(write=False)
+
+    @classmethod
+    def from_links(cls, size, starts, ends, weights):
+        """ graph of size regions with a one way link from starts[n] to ends[n] of weights[n] """
+        starts = numpy.asarray(starts, dtype=numpy.int64)
+        ends = numpy.asarray(ends, dtype=numpy.int64)
+        order = numpy.lexsort((ends, starts))
+        offsets = numpy.zeros(size + 1, dtype=numpy.int64)
+        numpy.cumsum(numpy.bincount(starts, minlength=size), out=offsets[1:])
+        return cls(
+            offsets,
+            ends[order].astype(numpy.int32),
+            numpy.asarray(weights, dtype=numpy.int32)[order]
+        )
+
+    @classmethod
+    def from_dict(cls, names, graph):
+        """ graph from a {name: {neighbour: distance}} dict over the regions called names, in id
+        order. raises ValueError naming any regions of the graph that aren't in names
+        """
+        ids = {name: num for num, name in enumerate(names)}
+        starts, ends, weights = [], [], []
+        for name, neighbours in graph.items():
+            starts.extend([name] * len(neighbours))
+            ends.extend(neighbours)
+            weights.extend(neighbours.values())
+
+        unknown = sorted({node for node in [*graph, *ends] if node not in ids})
+        if unknown:
+            raise ValueError("region graph links regions that don't exist: " + ", ".join(unknown))
+        starts = [ids[name] for name in starts]
+        ends = [ids[name] for name in ends]
+        return cls.from_links(len(ids), starts, ends, weights)
+
+    def to_dict(self, names):
+        """ the graph as a {name: {neighbour: distance}} dict, the inverse of from_dict """
+        neighbours = self.neighbours.tolist()
+        weights = self.weights.tolist()
+        offsets = self.offsets.tolist()
+        return {
+            name: {
+                names[neighbours[link]]: weights[link]
+                for link in range(offsets[num], offsets[num + 1])
+            }
+            for num, name in enumerate(names)
+        }
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def with_link(self, region1, region2, distance):
+        """ a copy of the graph with the link from region1 to region2 added or set to distance """
+        starts = numpy.repeat(numpy.arange(len(self)), numpy.diff(self.offsets))
+        keep = ~((starts == region1) & (self.neighbours == region2))
+        return RegionGraph.from_links(
+            len(self),
+            numpy.append(starts[keep], region1),
+            numpy.append(self.neighbours[keep], region2),
+            numpy.append(self.weights[keep], distance)
+        )
+
+    def problems(self, names=None):
+        """ descriptions of what is wrong with the graph as a map, empty if nothing is
+
+        every distance must be positive, every link must have the same distance both ways and
+        every region must be reachable from every other. names are used in the descriptions
+        """
+        def name(num):
+            return names[num] if names is not None else str(num)
+
+        size = len(self)
+        starts = numpy.repeat(numpy.arange(size), numpy.diff(self.offsets))
+        problems = []
+
+        for link in numpy.flatnonzero(self.weights <= 0).tolist():
+            problems.append(
+                "link " + name(int(starts[link])) + " -> " + name(int(self.neighbours[link]))
+                + " has distance " + str(int(self.weights[link]))
+            )
+
+        # links are sorted by (start, end), so their reverses can be found by binary search
+        keys = starts * size + self.neighbours
+        reverse_keys = self.neighbours.astype(numpy.int64) * size + starts
+        positions = numpy.minimum(numpy.searchsorted(keys, reverse_keys), max(len(keys) - 1, 0))
+        found = keys[positions] == reverse_keys
+        for link in numpy.flatnonzero(~found | (self.weights[positions] != self.weights)).tolist():
+            start, end = int(starts[link]), int(self.neighbours[link])
+            if found[link]:
+                reverse = " has " + str(int(self.weights[positions[link]]))
+            else:
+                reverse = " doesn't exist"
+            problems.append(
+                "link " + name(start) + " -> " + name(end) + " has distance "
+                + str(int(self.weights[link])) + " but " + name(end) + " -> " + name(start)
+                + reverse
+            )
+
+        if size:
+            reached = numpy.zeros(size, dtype=bool)
+            reached[0] = True
+            stack = [0]
+            neighbours = self.neighbours.tolist()
+            offsets = self.offsets.tolist()
+            while stack:
+                node = stack.pop()
+                for neighbour in neighbours[offsets[node]:offsets[node + 1]]:
+                    if not reached[neighbour]:
+                        reached[neighbour] = True
+                        stack.append(neighbour)
+            unreached = numpy.flatnonzero(~reached).tolist()
+            if unreached:
+                problems.append(
+                    str(len(unreached)) + " regions can't be reached from " + name(0) + ": "
+                    + ", ".join(name(num) for num in unreached[:10])
+                    + (", ..." if len(unreached) > 10 else "")
+                )
+        return problems
+
+    def validate(self, names=None):
+        """ raises ValueError listing the graph's problems (see problems) if it has any """
+        problems = self.problems(names)
+        if problems:
+            raise ValueError("invalid region graph:\n" + "\n".join(problems))
+        return self
+
+
+class Router:
+    """ weighted all-pairs shortest path table for a region graph
+
+    distances and predecessors are kept in one int array per source, indexed by target id. each
+    source row is allocated and filled by a single Dijkstra run the first time it is queried,
+    after that every distance lookup is a single array read. rows that are never queried cost
+    nothing, which keeps large maps from allocating size * size tables up front.
+    """
+
+    def __init__(self, graph):
+        """ graph: the RegionGraph to route over, node ids are region ids """
+        self.graph = graph
+        self.size = len(graph)
+
+        # the graph's arrays as lists, which are much faster to index one item at a time
+        self._offsets = graph.offsets.tolist()
+        self._neighbours = graph.neighbours.tolist()
+        self._weights = graph.weights.tolist()
+
+        # per source id, None until the row is built
+        self._distances = [None] * self.size
+        self._previous = [None] * self.size
+
+    def _build_row(self, source):
+        """ runs Dijkstra from source, filling its row of the tables """
+        distances = array("i", [UNREACHABLE]) * self.size
+        previous = array("i", [UNREACHABLE]) * self.size
+
+        offsets, neighbours, weights = self._offsets, self._neighbours, self._weights
+
+        distances[source] = 0
+        queue = [(0, source)]
+        while queue:
+            distance, node = heapq.heappop(queue)
+            if distance > distances[node]:
+                # stale queue entry
+                continue
+            for link in range(offsets[node], offsets[node + 1]):
+                neighbour = neighbours[link]
+                new_distance = distance + weights[link]
+                current = distances[neighbour]
+                if current == UNREACHABLE or new_distance < current:
+                    distances[neighbour] = new_distance
+                    previous[neighbour] = node
+                    heapq.heappush(queue, (new_distance, neighbour))
+
+        self._distances[source] = distances
+        self._previous[source] = previous
+        return distances
+
+    def row(self, source):
+        """ returns the distances from source to every node as a memoryview over the table """
+        return memoryview(self._distances[source] or self._build_row(source))
+
+    def distance(self, source, target):
+        """ shortest distance between two node ids, UNREACHABLE if there is no route """
+        return (self._distances[source] or self._build_row(source))[target]
+
+    def path(self, source, target):
+        """ list of node ids along the shortest route, None if there is no route """
+        if self.distance(source, target) == UNREACHABLE:
+            return None
+        previous = self._previous[source]
+        path = [target]
+        while path[-1] != source:
+            path.append(previous[path[-1]])
+        path.reverse()
+        return path
@@ -0,0 +1,198 @@
+import pygame
+
+
+def _field(name):
+    """ node attribute that marks its node as changed when given a different value """
+    private = "_" + name
+
+    def get(self):
+        return getattr(self, private)
+
+    def set(self, value):
+        current = getattr(self, private)
+        if value is not current and value != current:
+            setattr(self, private, value)
+            self.changed()
+
+    return property(get, set)
+
+
+class Node:
+    """ base class of everything drawn by a Scene
+
+    nodes are created once and then changed through their attributes, each change queues the
+    node so the renderer only redraws what moved. drawn is the area the node covered when it was
+    last drawn, None if it hasn't been.
+    """
+    __slots__ = ("scene", "drawn", "queued", "_visible")
+
+    def __init__(self, visible=True):
+        self.scene = None
+        self.drawn = None
+        self.queued = False
+        self._visible = visible
+
+    visible = _field("visible")
+
+    def changed(self):
+        if self.scene is not None and not self.queued:
+            self.queued = True
+            self.scene.dirty.append(self)
+
+    def area(self, display):
+        """ the part of the display the node covers """
+        raise NotImplementedError
+
+    def draw(self, display):
+        raise NotImplementedError
+
+
+class Fill(Node):
+    """ fills the whole display with a colour """
+    __slots__ = ("_colour",)
+
+    def __init__(self, colour, visible=True):
+        super(Fill, self).__init__(visible)
+        self._colour = colour
+
+    colour = _field("colour")
+
+    def area(self, display):
+        return display.get_rect()
+
+    def draw(self, display):
+        display.fill(self._colour)
+
+
+class Rect(Node):
+    """ a filled rectangle, or its outline if edge_width is given """
+    __slots__ = ("_rect", "_colour", "_edge_width")
+
+    def __init__(self, rect, colour, edge_width=0, visible=True):
+        super(Rect, self).__init__(visible)
+        self._rect = pygame.Rect(rect)
+        self._colour = colour
+        self._edge_width = edge_width
+
+    rect = _field("rect")
+    colour = _field("colour")
+    edge_width = _field("edge_width")
+
+    def area(self, display):
+        return pygame.Rect(self._rect)
+
+    def draw(self, display):
+        if self._edge_width:
+            pygame.draw.rect(display, self._colour, self._rect, self._edge_width)
+        else:
+            # fill is used over .draw.rect as it can be faster
+            display.fill(self._colour, self._rect)
+
+
+class Blit(Node):
+    """ a surface drawn with its top left corner at dest
+
+    surfaces are compared by identity, so a surface must not be drawn on once it is in a scene,
+    set a new surface instead
+    """
+    __slots__ = ("_surface", "_dest")
+
+    def __init__(self, surface, dest, visible=True):
+        super(Blit, self).__init__(visible)
+        self._surface = surface
+        self._dest = tuple(dest)[:2]
+
+    surface = _field("surface")
+
+    @property
+    def dest(self):
+        return self._dest
+
+    @dest.setter
+    def dest(self, dest):
+        dest = tuple(dest)[:2]
+        if dest != self._dest:
+            self._dest = dest
+            self.changed()
+
+    def area(self, display):
+        return pygame.Rect(self._dest, self._surface.get_size())
+
+    def draw(self, display):
+        display.blit(self._surface, self._dest)
+
+
+class Scene:
+    """ ordered layers of nodes kept between frames, see Graphics.update """
+
+    def __init__(self, *layers):
+        self.layers = {layer: [] for layer in layers}
+        # nodes changed since the last frame and areas of removed nodes
+        self.dirty = []
+        self.removed = []
+        # True when the whole scene must be drawn on the next frame
+        self.redraw = True
+
+    def __iter__(self):
+        for nodes in self.layers.values():
+            yield from nodes
+
+    def add(self, node, layer):
+        """ adds a node on top of a layer, returns the node """
+        node.scene = self
+        self.layers[layer].append(node)
+        node.changed()
+        return node
+
+    def remove(self, node, layer):
+        self.layers[layer].remove(node)
+        node.scene = None
+        if node.drawn is not None:
+            self.removed.append(node.drawn)
+            node.drawn = None
+
+    def clear(self, layer):
+        """ removes every node in a layer """
+        for node in self.layers[layer].copy():
+            self.remove(node, layer)
+
+    def invalidate(self):
+        """ draws the whole scene on the next frame """
+        self.redraw = True
+
+    def draw(self, target):
+        """ draws every visible node onto target, a surface, recording the areas they cover """
+        for node in self:
+            if node.visible:
+                node.draw(target)
+                node.drawn = node.area(target)
+            else:
+                node.drawn = None
+
+    def draw_dirty(self, target):
+        """ redraws only what changed since the last frame onto target, which must hold the last
+        frame. returns the areas redrawn: where changed nodes were and are now, and where removed
+        nodes were
+        """
+        areas = self.removed
+        for node in self.dirty:
+            if node.drawn is not None:
+                areas.append(node.drawn)
+            node.drawn = node.area(target) if node.visible and node.scene is self else None
+            if node.drawn is not None:
+                areas.append(node.drawn)
+
+        for area in areas:
+            target.set_clip(area)
+            for node in self:
+                if node.drawn is not None and node.drawn.colliderect(area):
+                    node.draw(target)
+        target.set_clip(None)
+        return list(areas)
+
+    def finish_frame(self):
+        for node in self.dirty:
+            node.queued = False
+        self.dirty.clear()
+        self.removed.clear()
+        self.redraw = False
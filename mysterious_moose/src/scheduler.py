@@ -0,0 +1,119 @@
+import logging
+import time
+from collections import deque
+
+import pygame
+
+log = logging.getLogger("main.scheduler")
+log.setLevel(logging.INFO)
+
+
+class FrameScheduler:
+    """ paces the main loop and reports how much of each frame's time budget is used
+
+    while something is animating frames are capped at fps. otherwise the loop sleeps in
+    pygame.event.wait until an event arrives or idle_timeout milliseconds pass, so static
+    screens use next to no CPU. pygame 1 has no wait timeout, there idle frames are capped at
+    idle_fps instead.
+    """
+
+    def __init__(self, fps=60, idle_timeout=500, idle_fps=10, history=600, report_interval=10):
+        self.fps = fps
+        self.idle_timeout = idle_timeout
+        self.idle_fps = idle_fps
+        self.report_interval = report_interval  # seconds between logged reports, 0 to disable
+
+        self.clock = pygame.time.Clock()
+        self.can_wait = pygame.version.vernum[0] >= 2
+
+        # seconds spent working on each of the last frames, excluding time spent waiting
+        self.frame_times = deque(maxlen=history)
+        self.idle_frames = 0
+        self._frame_start = None
+        self._last_report = time.perf_counter()
+
+    @property
+    def budget(self):
+        """ seconds available to each frame at the target frame rate """
+        return 1 / self.fps
+
+    def next_frame(self, animating=True):
+        """ ends the current frame, waits until the next one is due and returns its events """
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self.frame_times.append(now - self._frame_start)
+        if self.report_interval and now - self._last_report > self.report_interval:
+            self._last_report = now
+            log.debug("frame report: " + str(self.report()))
+
+        if animating:
+            self.clock.tick(self.fps)
+            events = pygame.event.get()
+        elif self.can_wait:
+            self.idle_frames += 1
+            event = pygame.event.wait(self.idle_timeout)
+            events = pygame.event.get()
+            if event.type != pygame.NOEVENT:
+                events.insert(0, event)
+            # keeps the clock from counting the wait towards the next animated frame
+            self.clock.tick()
+        else:
+            self.idle_frames += 1
+            self.clock.tick(self.idle_fps)
+            events = pygame.event.get()
+
+        self._frame_start = time.perf_counter()
+        return events
+
+    def report(self):
+        """ frame time statistics over the recent frames, in milliseconds """
+        if not self.frame_times:
+            return {"frames": 0}
+        times = sorted(self.frame_times)
+        return {
+            "frames": len(times),
+            "idle_frames": self.idle_frames,
+            "target_fps": self.fps,
+            "budget_ms": self.budget * 1000,
+            "mean_ms": sum(times) / len(times) * 1000,
+            "p95_ms": times[min(len(times) - 1, int(len(times) * 0.95))] * 1000,
+            "max_ms": times[-1] * 1000,
+            "over_budget": sum(1 for frame_time in times if frame_time > self.budget),
+            "fps": self.clock.get_fps()
+        }
+
+
+class StartupTimer:
+    """ records how long each phase of startup takes, up to the first frame
+
+    phases are consecutive, each one ends when the next starts or finish is called
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = []  # (name, seconds)
+        self._phase = None
+        self._phase_start = self.start
+        self.finished = False
+
+    def phase(self, name):
+        """ ends the current phase and starts name """
+        now = time.perf_counter()
+        if self._phase is not None:
+            self.phases.append((self._phase, now - self._phase_start))
+        self._phase = name
+        self._phase_start = now
+
+    def finish(self):
+        """ ends the last phase and logs the report, only the first call does anything """
+        if self.finished:
+            return
+        self.phase(None)
+        self.finished = True
+        log.info("startup report: " + str(self.report()))
+
+    def report(self):
+        """ milliseconds spent in each phase and in total """
+        output = {name: seconds * 1000 for name, seconds in self.phases}
+        output["total_ms"] = (self._phase_start - self.start) * 1000
+        return output
@@ -0,0 +1,96 @@
+import logging
+from collections import OrderedDict
+
+import pygame
+
+log = logging.getLogger("main.surface_cache")
+log.setLevel(logging.INFO)
+
+
+class SurfaceCache:
+    """ least recently used store of rendered text and scaled images, bounded by pixel memory
+
+    resolution changes and view switches ask for the same strings, icons and cards at the same
+    sizes again and again, the cache hands back the surface made the last time instead of
+    rasterizing it again. surfaces from the cache are shared, they must be copied before being
+    drawn on. surfaces larger than max_bytes are made but never stored.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._surfaces = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    @staticmethod
+    def _size_of(surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def get(self, key, create):
+        """ returns the surface stored under key, storing create() there first if there is none
+
+        key must be hashable and describe everything the surface depends on
+        """
+        try:
+            surface = self._surfaces[key]
+        except KeyError:
+            pass
+        else:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = create()
+        size = self._size_of(surface)
+        if size > self.max_bytes:
+            log.debug("not caching " + str(key[:2]) + ", larger than the cache")
+            return surface
+
+        self._surfaces[key] = surface
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, evicted = self._surfaces.popitem(last=False)
+            self.bytes -= self._size_of(evicted)
+            self.evictions += 1
+        return surface
+
+    def text(self, font, text, size, colour=None):
+        """ font.render(text, colour, size=size)[0], rendered once per (text, size, colour) """
+        if colour is None:
+            colour = tuple(font.fgcolor)
+        return self.get(
+            ("text", font, text, size, tuple(colour)),
+            lambda: font.render(text, colour, size=size)[0]
+        )
+
+    def scale(self, image, size):
+        """ pygame.transform.scale(image, size), scaled once per (image, size)
+
+        images are keyed by identity, so image must not be drawn on after being scaled
+        """
+        size = (int(size[0]), int(size[1]))
+        if image.get_size() == size:
+            return image
+        return self.get(("scale", image, size), lambda: pygame.transform.scale(image, size))
+
+    def clear(self):
+        self._surfaces.clear()
+        self.bytes = 0
+
+    def report(self):
+        """ usage statistics for logging """
+        return {
+            "surfaces": len(self._surfaces),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
@@ -1,13 +1,18 @@
-import random
 import math
 import warnings
 
-from src.world import World, world_regions, INDUSTRY_TO_CO2
+import numpy
+
+from src.events import NULL_SINK, Cure, Infection, RegionWipedOut, TurnEnd, TurnStart
+from src.world import INDUSTRY_TO_CO2
 
 VIRULENCE_FACTOR = 0.1
 
 weather_event_types = ['flood', 'heatwave', 'wildfire']
 
+# random number generator used when the caller doesn't pass one in
+default_rng = numpy.random.default_rng()
+
 
 # At the start of the game, sea level = 0
 # Find out initial sea level
@@ -17,67 +22,103 @@ weather_event_types = ['flood', 'heatwave', 'wildfire']
 
 
 class WeatherEvent:
-    def __init__(self, event_type="heatwave"):
+    def __init__(self, world, event_type="heatwave", rng=None):
         if not(event_type in weather_event_types):
-            warnings.warn(str(event_type) + ' is not a recognised event type. Setting type to heatwave as default')
+            warnings.warn(
+                str(event_type)
+                + ' is not a recognised event type. Setting type to heatwave as default'
+            )
             event_type = "heatwave"
+        rng = rng or default_rng
+        region_names = list(world.regions)
 
         if event_type == "heatwave":
-            self.region = random.choice(world_regions)
-            self.death_toll = random.randint(0, math.ceil(100 * (2 ** World.temperature_rise)))
+            self.region = region_names[rng.integers(len(region_names))]
+            self.death_toll = int(
+                rng.integers(0, math.ceil(100 * (2 ** world.temperature_rise)) + 1)
+            )
 
         if event_type == "flood":
-            self.region = random.choice(world_regions)
-            self.death_toll = random.randint(0, math.ceil(1000 * (2 ** World.sea_level)))
+            self.region = region_names[rng.integers(len(region_names))]
+            self.death_toll = int(rng.integers(0, math.ceil(1000 * (2 ** world.sea_level)) + 1))
 
         if event_type == "wildfire":
-            self.region = random.choice(world_regions)
-            self.death_toll = random.randint(0, math.ceil(10000 * (2 ** World.temperature_rise)))
-            World.co2_concentation += 0.5
+            self.region = region_names[rng.integers(len(region_names))]
+            self.death_toll = int(
+                rng.integers(0, math.ceil(10000 * (2 ** world.temperature_rise)) + 1)
+            )
+            world.co2_concentration += 0.5
 
 
 class PopulationChange:
+    """ every region's population at the start of a turn and after the climate's toll, kept as
+    arrays over region ids. regions gives the old per region dict view when it is wanted
+    """
+
     def __init__(self, world):
-        self.regions = {}
-        for region_name in world.regions:
-            self.regions[region_name] = {"int_pop": world.regions[region_name].population,
-                                    "fin_pop": 0,
-                                    "percentage_change": 0}
+        self.world = world
+        self.initial = world.populations.copy()
+        self.final = numpy.zeros_like(self.initial)
+
+    @property
+    def percentage_change(self):
+        initial = self.initial.astype(numpy.float64)
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            return numpy.where(initial == 0, 0, 100 * ((initial - self.final) / initial))
+
+    @property
+    def regions(self):
+        """ {region name: {"int_pop", "fin_pop", "percentage_change"}}, built on every call """
+        return {
+            region.name: {"int_pop": initial, "fin_pop": final, "percentage_change": change}
+            for region, initial, final, change in zip(
+                self.world.region_list, self.initial.tolist(), self.final.tolist(),
+                self.percentage_change.tolist()
+            )
+        }
 
     def __str__(self):
-        """Prints the object in a human readable table format"""
-
-        print("|Region              |Initial population  |Final population    |Percentage change   ")
-        print("-------------------------------------------------------------------------------------")
-        for region_name in self.regions:
-            print("|" + region_name + " " * (20 - len(region_name)) +
-                  "|" + str(self.regions[region_name]["int_pop"]) +
-                  " " * (20 - len(str(self.regions[region_name]["int_pop"]))) +
-                  "|" + str(self.regions[region_name]["fin_pop"]) +
-                  " " * (20 - len(str(self.regions[region_name]["fin_pop"]))) +
-                  "|" + str(self.regions[region_name]["percentage_change"])
-                  )
+        """Returns the object in a human readable table format"""
+        lines = [
+            "|Region              |Initial population  |Final population    |Percentage change   ",
+            "-------------------------------------------------------------------------------------"
+        ]
+        for region_name, change in self.regions.items():
+            lines.append(
+                "|" + region_name.ljust(20) + "|" + str(change["int_pop"]).ljust(20)
+                + "|" + str(change["fin_pop"]).ljust(20) + "|" + str(change["percentage_change"])
+            )
+        return "\n".join(lines)
 
     def set_final_population(self, region_name, fin_pop):
-        int_pop = self.regions[region_name]["int_pop"]
-        self.regions[region_name]["fin_pop"] = fin_pop
+        self.final[self.world.regions[region_name].id] = fin_pop
+
+    def set_final_populations(self, populations):
+        """ sets every region's final population from an array over region ids """
+        self.final[:] = populations
+
 
-        if int_pop == 0:
-            self.regions[region_name]["percentage_change"] = 0
-        else:
-            self.regions[region_name]["percentage_change"] = 100 * ((int_pop - fin_pop) / int_pop)
+def virus_co2(virus):
+    """Returns the CO2 concentration rise in ppm a virus causes in one turn"""
+    return len(virus.infection) * virus.impact * INDUSTRY_TO_CO2[virus.industry] * 0.001
 
 
-def simulate_world_changes(world, virus):
+def simulate_world_changes(world, virus, events=NULL_SINK):
     """Simulates one turn of world changes, returning a modified world object"""
     industry_impacts = INDUSTRY_TO_CO2  # co2 impacts as given by industry id
 
     # implement virus affect on CO2
-    for region in virus.affected_regions:
+    for region in virus.infection:
         world.co2_concentration += virus.impact * industry_impacts[virus.industry] * 0.001
 
+    return [world, simulate_climate_changes(world, events)]
+
+
+def simulate_climate_changes(world, events=NULL_SINK):
+    """Simulates one turn of the world reacting to its CO2 concentration, returns
+    PopulationChange
+    """
     # calculate sea level rises
-    initial_sea_level = world.sea_level
     sea_level_rise = (world.co2_concentration - 300) * 0.02
     world.sea_level += sea_level_rise
 
@@ -85,85 +126,141 @@ def simulate_world_changes(world, virus):
     regions = world.regions.values()
     for region in regions:
         # assume population is evenly distributed between 1m and average elevation
-        region.population -= math.ceil(((world.co2_concentration-300) * region.initial_population) / 7000000000)
+        region.population -= math.ceil(
+            ((world.co2_concentration-300) * region.initial_population) / 7000000000
+        )
         population_change.set_final_population(region.name, region.population)
         if region.population <= 0:
             region.population = 0
+            if not region.destroyed and events.enabled:
+                events.emit(RegionWipedOut(region.name))
             region.destroyed = 1
-            print(region.name + " has been wiped out")
 
     world.temperature_rise += (world.co2_concentration - 300) * 0.05
 
+    return population_change
 
 
-    return [world, population_change]
-
-
-def simulate_virus_changes(world, virus):
+def simulate_virus_changes(world, virus, events=NULL_SINK, rng=None):
     """Simulates one turn of a viruses spreading and being eliminated. Returns a modified virus object."""
-    # each infected region will attempt to infect another region, this region may already be infected
-    print(f'Let us see how far the virus spreads. Virus virulence is {virus.virulence} out of 100.')
-    affected_regions_at_beginning_of_attack = virus.affected_regions.copy()
+    rng = rng or default_rng
+    infection = virus.infection
+    infection.prepare(virus.virulence * VIRULENCE_FACTOR)
+
+    # each infected region will attempt to infect every region on the frontier, the uninfected
+    # and undestroyed regions it can reach
+    affected_regions_at_beginning_of_attack = list(infection)
+    targets = infection.frontier_regions()
+    # one randint(0, distance) draw per attempt, all made in a single call, reading each
+    # source's route row at the targets' ids
+    target_ids = numpy.array([target.id for target in targets], dtype=numpy.int64)
+    routes = world.routes
+    distances = numpy.array([
+        numpy.frombuffer(routes.row(region.id), dtype=numpy.intc)[target_ids]
+        for region in affected_regions_at_beginning_of_attack
+    ], dtype=numpy.int64).reshape(-1)
+    draws = iter(rng.integers(0, distances + 1).tolist())
     for region in affected_regions_at_beginning_of_attack:
-        print(f'Let us see how far the virus spreads from {region.name}.')
-        for target in world.regions.values():
-            if virus.virulence * VIRULENCE_FACTOR > random.randint(0, world.distance_between(region, target)):      # todo fix virulence to feel linked to factor
-                if target in virus.affected_regions:
-                    # country was already infected
-                    continue
-                else:
-                    virus.affected_regions.append(target)
-                    print(target.name + " is now infected with the virus!")
-    print()
+        for target in targets:
+            # todo fix virulence to feel linked to factor
+            if virus.virulence * VIRULENCE_FACTOR > next(draws):
+                # add returns False if another region got there first this turn
+                if infection.add(target) and events.enabled:
+                    events.emit(Infection(target.name, region.name))
 
     # based on detectability each region has a random chance of stopping the virus
-    print(f'Let us see which regions can kick the virus out. Virus detectability is {virus.detectability} out of 100.')
-    affected_regions_at_beginning_of_defence = virus.affected_regions.copy()
-    for region in affected_regions_at_beginning_of_defence:
-        print(f'Let us see if {region.name} can kick the virus out.')
-        if virus.detectability * 0.1 > random.randint(0, len(virus.affected_regions) + 10):
-            virus.affected_regions.remove(region)
-            print(region.name + " successfully got rid of the virus!")
-        else:
-            print(region.name + " could not get rid of the virus!")
-        print()
+    affected_regions_at_beginning_of_defence = list(infection)
+    draws = rng.random(len(affected_regions_at_beginning_of_defence)).tolist()
+    for region, draw in zip(affected_regions_at_beginning_of_defence, draws):
+        # scaled to randint(0, len(infection) + 10) as regions are removed
+        if virus.detectability * 0.1 > int(draw * (len(infection) + 11)):
+            infection.remove(region)
+            if events.enabled:
+                events.emit(Cure(region.name))
     return virus
 
 
-def simulate_turn(world, virus):
-    """"Simulates one turn of world changes, returning a list comprising of a world and virus object"""
-    print('-'*100)
-    print('The turn is to begin.')
-    print(
-        'Currently infected regions at beginning of turn:',
-        ', '.join([region.name for region in virus.affected_regions])
-    )
-    print()
-    world_and_population_change = simulate_world_changes(world, virus)
+def simulate_viruses_changes(world, viruses, events=NULL_SINK, rng=None):
+    """Simulates one turn of several viruses spreading and being eliminated, one after another"""
+    for virus in viruses:
+        simulate_virus_changes(world, virus, events, rng)
+    return viruses
+
+
+def simulate_turn(world, virus, engine="object", events=NULL_SINK, rng=None):
+    """"Simulates one turn of world changes, returning a list comprising of a world and virus object
+
+    engine selects between the per-object simulation ("object") and the NumPy array simulation
+    ("vector") from src.vector_simulation. What happens during the turn is reported to events.
+    rng is a numpy.random.Generator, runs with the same seed replay identically.
+    """
+    if engine == "vector":
+        # imported here as the array engine builds on this module
+        import src.vector_simulation as vector_simulation
+        return vector_simulation.simulate_turn(world, virus, events, rng)
+    elif engine != "object":
+        raise ValueError(str(engine) + " is not a recognised simulation engine")
+
+    if events.enabled:
+        events.emit(TurnStart([region.name for region in virus.affected_regions]))
+    world_and_population_change = simulate_world_changes(world, virus, events)
     world = world_and_population_change[0]
     population_change = world_and_population_change[1]
-    virus = simulate_virus_changes(world, virus)
+    virus = simulate_virus_changes(world, virus, events, rng)
+    if events.enabled:
+        events.emit(TurnEnd([region.name for region in virus.affected_regions]))
 
-    print('The turn has ended.')
-    print('-'*100)
-    if not virus.affected_regions:
-        print('The virus has been wiped out!')
+    if not virus.infection:
         return
     else:
-        print(
-            'Currently infected regions at end of turn:',
-            ', '.join([region.name for region in virus.affected_regions])
-        )
-        print()
         return [world, virus, population_change]
 
 
+def simulate_viruses_turn(world, viruses, engine="object", events=NULL_SINK, rng=None):
+    """Simulates one turn of every virus in viruses on one world
+
+    The CO2 of every virus is added up first and the world reacts to the total once, then the
+    viruses spread and are cured together, so a turn costs one world update however many viruses
+    there are. The vector engine also makes the random draws of all viruses at once. Returns
+    [world, viruses still infecting regions, PopulationChange], or None once none are. engine,
+    events and rng are as for simulate_turn.
+    """
+    if engine == "vector":
+        import src.vector_simulation as vector_simulation
+        climate_changes = vector_simulation.simulate_climate_changes
+        viruses_changes = vector_simulation.simulate_viruses_changes
+    elif engine == "object":
+        climate_changes = simulate_climate_changes
+        viruses_changes = simulate_viruses_changes
+    else:
+        raise ValueError(str(engine) + " is not a recognised simulation engine")
+
+    def infected_names():
+        # regions infected by any virus, once each
+        return list(dict.fromkeys(
+            region.name for virus in viruses for region in virus.infection
+        ))
+
+    if events.enabled:
+        events.emit(TurnStart(infected_names()))
+    world.co2_concentration += sum(virus_co2(virus) for virus in viruses)
+    population_change = climate_changes(world, events)
+    viruses_changes(world, [virus for virus in viruses if virus.infection], events, rng)
+    if events.enabled:
+        events.emit(TurnEnd(infected_names()))
+
+    active = [virus for virus in viruses if virus.infection]
+    if not active:
+        return
+    return [world, active, population_change]
+
+
 # model extreme weather events
-# def simulate_weather_events():
+# def simulate_weather_events(earth, rng):
 #
-#    number_of_events = math.floor(random.randint(0, 21 + (earth.sea_level * earth.co2_concentration * 0.01)) / 20)
+#    number_of_events = math.floor(rng.integers(0, 22 + (earth.sea_level * earth.co2_concentration * 0.01)) / 20)
 #    for i in range(number_of_events):
-#        event = WeatherEvent(random.choice(weather_event_types))
+#        event = WeatherEvent(earth, rng.choice(weather_event_types), rng)
 #        earth.region[event.region].population -= event.death_toll
 #        if earth.region[event.region].population <= 0:
 #            earth.region[event.region].population = 0
@@ -0,0 +1,134 @@
+import numpy
+
+from src.events import NULL_SINK, Cure, Infection, RegionWipedOut, TurnEnd, TurnStart
+from src.infection import joint_frontier
+from src.turn_simulation import PopulationChange, VIRULENCE_FACTOR, default_rng, virus_co2
+
+
+def simulate_world_changes(world, virus, events=NULL_SINK):
+    """Simulates one turn of world changes on the world's region arrays, returns PopulationChange"""
+    world.co2_concentration += virus_co2(virus)
+    return simulate_climate_changes(world, events)
+
+
+def simulate_climate_changes(world, events=NULL_SINK):
+    """Simulates one turn of the world reacting to its CO2 concentration on the region arrays,
+    returns PopulationChange
+    """
+    world.sea_level += (world.co2_concentration - 300) * 0.02
+
+    population_change = PopulationChange(world)
+    deaths = numpy.ceil(
+        ((world.co2_concentration - 300) * world.initial_populations) / 7000000000
+    ).astype(numpy.int64)
+    world.populations -= deaths
+    population_change.set_final_populations(world.populations)
+
+    wiped_out = world.populations <= 0
+    world.populations[wiped_out] = 0
+    world.recount_population()
+    if events.enabled:
+        for num in numpy.flatnonzero(wiped_out & ~world.destroyed):
+            events.emit(RegionWipedOut(world.region_list[num].name))
+    world.destroyed |= wiped_out
+
+    world.temperature_rise += (world.co2_concentration - 300) * 0.05
+
+    return population_change
+
+
+def nearest_source(world, sources, target):
+    """Returns the source region with the shortest route to target"""
+    routes = world.routes
+    reachable = [
+        (routes.distance(source.id, target.id), source) for source in sources
+        if routes.distance(source.id, target.id) >= 0
+    ]
+    return min(reachable, key=lambda pair: pair[0])[1]
+
+
+def simulate_virus_changes(world, virus, events=NULL_SINK, rng=None):
+    """Simulates one turn of a virus spreading and being eliminated on the world's region arrays
+
+    Every region infected at the start of the turn makes one attempt on every region in the
+    frontier, succeeding when virulence * VIRULENCE_FACTOR beats a draw from randint(0, distance)
+    as in the per-object engine. Rather than drawing per attempt, each frontier region gets one
+    draw against its combined chance of being infected, kept up to date by virus.infection.
+    Detection is drawn as in the per-object engine, against the infected count as it shrinks
+    while regions are cleared one by one.
+    """
+    rng = rng or default_rng
+    infection = virus.infection
+    infection.prepare(virus.virulence * VIRULENCE_FACTOR)
+    sources = list(infection) if events.enabled else None
+
+    frontier = infection.frontier
+    hits = frontier[rng.random(len(frontier)) < infection.probabilities(frontier)]
+    for region_id in hits.tolist():
+        target = world.region_list[region_id]
+        infection.add(target)
+        if events.enabled:
+            events.emit(Infection(target.name, nearest_source(world, sources, target).name))
+
+    infected = list(infection)
+    draws = rng.random(len(infected)).tolist()
+    for region, draw in zip(infected, draws):
+        # scaled to randint(0, len(infection) + 10) as regions are removed
+        if virus.detectability * 0.1 > int(draw * (len(infection) + 11)):
+            infection.remove(region)
+            if events.enabled:
+                events.emit(Cure(region.name))
+
+    return virus
+
+
+def simulate_viruses_changes(world, viruses, events=NULL_SINK, rng=None):
+    """Simulates one turn of several viruses spreading and being eliminated on one world
+
+    Each virus behaves as in simulate_virus_changes, but the frontiers of all of them are found
+    together and the infection and detection draws of every virus are made in one call each.
+    """
+    rng = rng or default_rng
+    infections = [virus.infection for virus in viruses]
+    for virus in viruses:
+        virus.infection.prepare(virus.virulence * VIRULENCE_FACTOR)
+    sources = [list(infection) for infection in infections] if events.enabled else None
+
+    owners, region_ids, probabilities = joint_frontier(infections)
+    hits = rng.random(len(region_ids)) < probabilities
+    for owner, region_id in zip(owners[hits].tolist(), region_ids[hits].tolist()):
+        target = world.region_list[region_id]
+        infections[owner].add(target)
+        if events.enabled:
+            events.emit(
+                Infection(target.name, nearest_source(world, sources[owner], target).name)
+            )
+
+    # each region draws from randint(0, infected count + 10) of its own virus, the count
+    # shrinking as regions are cured
+    counts = [len(infection) for infection in infections]
+    draws = rng.random(sum(counts)).tolist()
+    position = 0
+    for virus, infection, count in zip(viruses, infections, counts):
+        for region, draw in zip(list(infection), draws[position:position + count]):
+            if virus.detectability * 0.1 > int(draw * (len(infection) + 11)):
+                infection.remove(region)
+                if events.enabled:
+                    events.emit(Cure(region.name))
+        position += count
+
+    return viruses
+
+
+def simulate_turn(world, virus, events=NULL_SINK, rng=None):
+    """Simulates one turn with the array engine, returns the same values as the per-object engine"""
+    if events.enabled:
+        events.emit(TurnStart([region.name for region in virus.affected_regions]))
+    population_change = simulate_world_changes(world, virus, events)
+    virus = simulate_virus_changes(world, virus, events, rng)
+    if events.enabled:
+        events.emit(TurnEnd([region.name for region in virus.affected_regions]))
+
+    if not virus.infection:
+        return
+    return [world, virus, population_change]
@@ -1,6 +1,6 @@
-import math
+import copy
 
-import pygame
+from src.infection import Infection
 
 
 class Virus:
@@ -14,7 +14,24 @@ class Virus:
         self.name = ""
         self.industry = industry  # the industry the virus is attacking
         self.released = False  # whether the virus has been launched or not
-        self.affected_regions = [start_region]
+        # regions the virus is in, start_region.world is the world it plays in
+        self.infection = Infection(start_region.world, [start_region])
+
+    @property
+    def affected_regions(self):
+        """ list of the infected regions, in the order they were infected """
+        return list(self.infection.regions.values())
+
+    @affected_regions.setter
+    def affected_regions(self, regions):
+        self.infection = Infection(self.infection.world, regions)
+
+    def fork(self, world):
+        """ copy of the virus infecting the same regions of another world, such as a fork """
+        virus = copy.copy(self)
+        virus.blocks = self.blocks.copy()
+        virus.infection = self.infection.fork(world)
+        return virus
 
     def update_stats(self):
         """ updates a virus's key stats to current block values"""
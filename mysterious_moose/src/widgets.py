@@ -0,0 +1,138 @@
+import bisect
+
+import pygame
+
+from src.scene import Blit
+
+
+class VirtualList:
+    """ a column of equally spaced cards of which only the rows on screen are drawn or hit tested
+
+    row num is placed at (x, top + num*row_height + scroll). card(num) returns the surface of a
+    row and is only called for visible rows, so the cost of a frame doesn't grow with length.
+    the rows' Blit nodes are kept in layer of scene between layouts.
+    """
+
+    def __init__(self, scene, layer, card, x, top, row_height, view_height, length=0, scroll=0):
+        self.scene = scene
+        self.layer = layer
+        self.card = card
+        self.x = x
+        self.top = top
+        self.row_height = row_height
+        self.view_height = view_height
+        self.length = length
+        self.scroll = scroll
+
+        # Blit node of each visible row
+        self.nodes = {}
+
+    def row_y(self, num):
+        return self.top + num*self.row_height + self.scroll
+
+    def visible(self):
+        """ range of the rows that are at least partly on screen """
+        if self.row_height <= 0:
+            return range(self.length)
+        first = max(0, (-self.scroll - self.top) // self.row_height)
+        # rows start at top + num*row_height + scroll, the last visible one starts above the bottom
+        last = min(self.length, -(-(self.view_height - self.top - self.scroll) // self.row_height))
+        return range(first, max(first, last))
+
+    def layout(self, length=None, scroll=None):
+        """ updates the scene's nodes to show the visible rows, after a scroll or list change
+
+        rows are redrawn from card(num) as the list may have changed under them
+        """
+        if length is not None:
+            self.length = length
+        if scroll is not None:
+            self.scroll = scroll
+
+        visible = self.visible()
+        for num in [num for num in self.nodes if num not in visible]:
+            self.scene.remove(self.nodes.pop(num), self.layer)
+        for num in visible:
+            surface = self.card(num)
+            dest = (self.x, self.row_y(num))
+            node = self.nodes.get(num)
+            if node is None:
+                self.nodes[num] = self.scene.add(Blit(surface, dest), self.layer)
+            else:
+                node.surface = surface
+                node.dest = dest
+
+    def hit(self, point):
+        """ index of the visible row under point, -1 if there is none """
+        if self.row_height <= 0:
+            return -1
+        num = (point[1] - self.top - self.scroll) // self.row_height
+        node = self.nodes.get(num)
+        if node is None:
+            return -1
+        return num if pygame.Rect(node.dest, node.surface.get_size()).collidepoint(point) else -1
+
+
+class HitIndex:
+    """ uniform grid of widget rects for finding the topmost widget under the mouse
+
+    each rect is stored in every cell_size square cell it overlaps, so a lookup only checks the
+    few rects sharing the point's cell. the index is built when a layout changes and queried
+    every frame, a single widget that moves is re-indexed with update. widgets added later are
+    on top of earlier ones.
+    """
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self._cells = {}
+        # widget: (order it was added in, rect)
+        self._widgets = {}
+        self._added = 0
+
+    def __len__(self):
+        return len(self._widgets)
+
+    def clear(self):
+        self._cells.clear()
+        self._widgets.clear()
+        self._added = 0
+
+    def _cells_of(self, rect):
+        size = self.cell_size
+        for cell_x in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cell_y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield cell_x, cell_y
+
+    def _insert(self, order, rect, widget):
+        self._widgets[widget] = (order, rect)
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        entry = (order, rect, widget)
+        for cell in self._cells_of(rect):
+            # cells stay sorted by order, which is unique, so later widgets stay on top
+            bisect.insort(self._cells.setdefault(cell, []), entry)
+
+    def add(self, rect, widget):
+        """ indexes widget, any hashable value other than None, as covering rect """
+        self._added += 1
+        self._insert(self._added, pygame.Rect(rect), widget)
+
+    def update(self, rect, widget):
+        """ moves an added widget to rect, keeping its place in the stacking order """
+        order, old_rect = self._widgets[widget]
+        for cell in self._cells_of(old_rect) if old_rect.width > 0 < old_rect.height else ():
+            entries = self._cells[cell]
+            entries.remove((order, old_rect, widget))
+            if not entries:
+                del self._cells[cell]
+        self._insert(order, pygame.Rect(rect), widget)
+
+    def hit(self, point):
+        """ the topmost widget whose rect contains point, None if there is none """
+        cell = self._cells.get((point[0] // self.cell_size, point[1] // self.cell_size))
+        if cell is None:
+            return None
+        for _, rect, widget in reversed(cell):
+            if rect.collidepoint(point):
+                return widget
+        return None
@@ -1,4 +1,7 @@
-import itertools
+import numpy
+
+import src.region_data as region_data
+from src.routing import RegionGraph, Router, UNREACHABLE
 
 
 INDUSTRIES = ['Chemical Manufacturing', 'Vehicle Production', 'Power Plant']
@@ -7,106 +10,203 @@ INDUSTRY_TO_CO2 = {0: 30, 1: 50, 2: 70}
 
 
 class Region:
-    """Main class for region"""
+    """Main class for region
+
+    a region is a view onto its row of the world's region arrays, so it holds no state of its own
+    """
+    __slots__ = ("world", "id", "name")
 
-    def __init__(self, name, elevation, population):
+    def __init__(self, world, region_id, name):
+        self.world = world
+        self.id = region_id
         self.name = name
-        self.elevation = elevation
-        self.population = population
-        self.initial_population = population
-        self.destroyed = 0
 
+    @property
+    def population(self):
+        return int(self.world.populations[self.id])
 
-world_regions = ['USA', 'Canada', 'Mexico', 'Peru', 'Argentina', 'Brazil', 'West Europe', 'India', 'Australia',
-           'North Africa', 'South Africa', 'East Europe', 'Madagascar', 'Indonesia', 'Japan', 'Middle East',
-           'New Zealand', 'China', 'Greenland', 'Cuba']
+    @population.setter
+    def population(self, population):
+        # keep the world's running total in step
+        self.world._population += population - int(self.world.populations[self.id])
+        self.world.populations[self.id] = population
 
+    @property
+    def initial_population(self):
+        return int(self.world.initial_populations[self.id])
+
+    @property
+    def elevation(self):
+        return float(self.world.elevations[self.id])
+
+    @property
+    def destroyed(self):
+        return int(self.world.destroyed[self.id])
+
+    @destroyed.setter
+    def destroyed(self, destroyed):
+        self.world.destroyed[self.id] = destroyed
 
 
 class World:
 
-    DISTANCES = {
-        'Canada': {'Greenland': 9, 'USA': 3},
-        'USA': {'West Europe': 14, 'Mexico': 4, 'Cuba': 4, 'Canada': 9},
-        'Cuba': {'Mexico': 2, 'USA': 4},
-        'Mexico': {'North Africa': 16, 'Peru': 4, 'USA': 4, 'Cuba': 2},
-        'Peru': {'Brazil': 4, 'Argentina': 5, 'Mexico': 4},
-        'Brazil': {'South Africa': 11, 'Peru': 4},
-        'Argentina': {'Peru': 5},
-        'Greenland': {'West Europe': 6, 'Canada': 9},
-        'West Europe': {'East Europe': 2, 'North Africa': 5, 'USA': 14, 'Greenland': 6},
-        'North Africa': {'South Africa': 5, 'Mexico': 16, 'West Europe': 5},
-        'South Africa': {'Madagascar': 3, 'Brazil': 11, 'North Africa': 5},
-        'Madagascar': {'South Africa': 3},
-        'East Europe': {'Russia': 8, 'Middle East': 5, 'West Europe': 2},
-        'Russia': {'China': 6, 'East Europe': 8},
-        'Middle East': {'China': 6, 'India': 4, 'East Europe': 5},
-        'China': {'Japan': 4, 'Russia': 6, 'Middle East': 6},
-        'Japan': {'China': 4},
-        'India': {'Indonesia': 6, 'Middle East': 4},
-        'Indonesia': {'Australia': 5, 'India': 6},
-        'Australia': {'New Zealand': 5, 'Indonesia': 5},
-        'New Zealand': {'Australia': 5},
-    }
-
-    def __init__(self):
+    def __init__(self, region_file='data/regions.txt', distances='data/map.json'):
+        """ region_file is a tab separated name, elevation, population table, or a .npy table
+        converted from one (see region_data). distances is the region graph, as a RegionGraph, a
+        {name: {neighbour: distance}} dict or the path of a json file holding one. graphs are
+        validated (see RegionGraph.problems) and a ValueError is raised if they aren't a map
+        """
         self.sea_level = 0
         self.co2_concentration = 300  # ppm
         self.temperature_rise = 0
-        self.regions = self._load_regions()
-        self._population = 0
+        self.regions = self._load_regions(region_file)
+        # Region objects in id order
+        self.region_list = list(self.regions.values())
+
+        if isinstance(distances, str):
+            distances = region_data.read_graph(distances)
+        if not isinstance(distances, RegionGraph):
+            distances = RegionGraph.from_dict(self.regions, distances)
+        # region graph indexed by region id, never changed in place so worlds can share it
+        self.graph = distances.validate(list(self.regions))
+        self._routes = None
+
+    def snapshot(self):
+        """ captures the world's current state, see WorldSnapshot """
+        return WorldSnapshot(self)
+
+    def restore(self, snapshot):
+        """ returns the world to the state in a snapshot taken from it or one of its forks """
+        self.sea_level = snapshot.sea_level
+        self.co2_concentration = snapshot.co2_concentration
+        self.temperature_rise = snapshot.temperature_rise
+        self.populations[:] = snapshot.populations
+        self.destroyed[:] = snapshot.destroyed
+        self._population = snapshot.population
+        self.graph = snapshot.graph
+        self._routes = snapshot._routes
+
+    def fork(self):
+        """ returns an independent copy of the world, see WorldSnapshot.fork """
+        return self.snapshot().fork()
+
+    def reset(self):
+        """ returns the world to its starting state without reading the region file again """
+        self.sea_level = 0
+        self.co2_concentration = 300
+        self.temperature_rise = 0
+        self.populations[:] = self.initial_populations
+        self.destroyed[:] = False
+        self.recount_population()
 
     @property
     def population(self):
-        population = 0
-        for region in self.regions:
-            population += self.regions[region].population
+        """ total population, kept up to date as region populations change """
+        return self._population
 
-        self._population = population
-        return population
+    def recount_population(self):
+        """ recalculates the total population after self.populations is changed directly """
+        self._population = int(self.populations.sum())
 
-    def _load_regions(self):
-        regions = {}
-        with open('data/regions.txt', 'r') as region_file:
-            for line in region_file:
-                split_line = line.split('\t')
-                name = split_line[0]
-                average_elevation = split_line[1]
-                population = int(split_line[2])
-                regions[name] = Region(name, average_elevation, population)
+    def _load_regions(self, region_file):
+        table = region_data.load(region_file)
+        names = table["name"].tolist()
 
-        return regions
+        # region state, indexed by region id. the columns of the table never change, so they
+        # are used in place, and shared between processes when the table is memory mapped
+        self.initial_populations = table["population"]
+        self.elevations = table["elevation"]
+        self.populations = numpy.array(self.initial_populations, dtype=numpy.int64)
+        self.destroyed = numpy.zeros(len(names), dtype=bool)
+        self.recount_population()
 
-    def distance_between(self, region1, region2):
-        region1_name = region1.name
-        region2_name = region2.name
-        shortest_path = self._find_shortest_path(region1_name, region2_name)
-        distance = sum(
-            self.DISTANCES[region1_name][region2_name]
-            for region1_name, region2_name in self._pairwise(shortest_path)
+        return {name: Region(self, num, name) for num, name in enumerate(names)}
+
+    @property
+    def routes(self):
+        """ shortest path table for the region graph, built on first use """
+        if self._routes is None:
+            self._routes = Router(self.graph)
+        return self._routes
+
+    def invalidate_routes(self):
+        """ drops the shortest path table so it is rebuilt from self.graph on next use """
+        self._routes = None
+
+    @property
+    def distances(self):
+        """ the region graph as a {name: {neighbour: distance}} dict, built on every call """
+        return self.graph.to_dict([region.name for region in self.region_list])
+
+    def set_distance(self, region1_name, region2_name, distance):
+        """ sets the distance of the link between two regions, both ways, adding it if needed """
+        region1, region2 = self.regions[region1_name].id, self.regions[region2_name].id
+        # a new graph, other worlds sharing the old one keep it
+        self.graph = self.graph.with_link(region1, region2, distance).with_link(
+            region2, region1, distance
         )
+        self.invalidate_routes()
+
+    def distance_between(self, region1, region2):
+        distance = self.routes.distance(region1.id, region2.id)
+        if distance == UNREACHABLE:
+            raise ValueError("no route from " + region1.name + " to " + region2.name)
         return distance
 
-    def _find_shortest_path(self, start, end, path=None):
-        if not path:
-            path = []
-        path = path + [start]
-        if start == end:
-            return path
-        if start not in self.DISTANCES:
+    def path_between(self, region1, region2):
+        """ names of the regions along the shortest route, None if there is no route """
+        path = self.routes.path(region1.id, region2.id)
+        if path is None:
             return None
-        shortest = None
-        for node in self.DISTANCES[start]:
-            if node not in path:
-                newpath = self._find_shortest_path(node, end, path)
-                if newpath:
-                    if not shortest or len(newpath) < len(shortest):
-                        shortest = newpath
-        return shortest
-
-    def _pairwise(self, iterable):
-        """s -> (s0,s1), (s1,s2), (s2, s3), ..."""
-        a, b = itertools.tee(iterable)
-        next(b, None)
-        return zip(a, b)
+        return [self.region_list[node].name for node in path]
+
+
+class WorldSnapshot:
+    """ frozen copy of a world's changing state
 
+    only the arrays that change during a game are copied. initial populations, elevations, the
+    region graph and its route table never change in place, so they are shared with the world
+    the snapshot was taken from and with every world forked from it. set_distance gives a world
+    a new graph, the snapshot keeps the graph it was taken with.
+    """
+
+    def __init__(self, world):
+        self.world = world
+        self.sea_level = world.sea_level
+        self.co2_concentration = world.co2_concentration
+        self.temperature_rise = world.temperature_rise
+        self.populations = world.populations.copy()
+        self.destroyed = world.destroyed.copy()
+        self.population = world.population
+        self.graph = world.graph
+        self._routes = world._routes
+
+    @property
+    def routes(self):
+        """ route table of the snapshot's graph, built on first use and shared by its forks """
+        if self._routes is None:
+            self._routes = Router(self.graph)
+        return self._routes
+
+    def fork(self):
+        """ creates a new World in the snapshot's state without reading the region file """
+        source = self.world
+        world = World.__new__(World)
+        world.sea_level = self.sea_level
+        world.co2_concentration = self.co2_concentration
+        world.temperature_rise = self.temperature_rise
+
+        world.populations = self.populations.copy()
+        world.initial_populations = source.initial_populations
+        world.elevations = source.elevations
+        world.destroyed = self.destroyed.copy()
+        world._population = self.population
+        world.regions = {
+            region.name: Region(world, region.id, region.name) for region in source.region_list
+        }
+        world.region_list = list(world.regions.values())
+
+        world.graph = self.graph
+        # build the route table once so every fork shares it
+        world._routes = self.routes
+        return world
@@ -0,0 +1,133 @@
+import argparse
+import os
+
+import numpy
+
+import src.region_data as region_data
+
+POPULATIONS = ("lognormal", "pareto", "uniform")
+MAX_DISTANCE = 16  # longest link, as on the stock map
+
+
+def populations(rng, size, distribution="lognormal", spread=1.5, total=7000000000):
+    """ region populations summing to about total, at least 1000 each
+
+    lognormal and pareto give a few very large regions, spread being the sigma of the lognormal
+    and the shape of the pareto (lower is more uneven). uniform ignores spread
+    """
+    if distribution == "lognormal":
+        weights = rng.lognormal(mean=0, sigma=spread, size=size)
+    elif distribution == "pareto":
+        weights = rng.pareto(spread, size=size) + 1
+    elif distribution == "uniform":
+        weights = rng.uniform(0.5, 1.5, size=size)
+    else:
+        raise ValueError("unknown population distribution " + repr(distribution))
+    return numpy.maximum((weights / weights.sum() * total).astype(numpy.int64), 1000)
+
+
+def links(rng, size, degree=4, long_links=0.05):
+    """ the (start, end) region id pairs of a connected graph with about degree links per region
+
+    regions are placed at random points of a square. a ring through them, snaking along
+    horizontal bands, keeps the graph connected and the rest of the links join regions a few
+    steps apart along it, so most links are between neighbours like borders are. a long_links
+    fraction join random regions anywhere instead, like flight routes. returns the start and end
+    arrays and the points
+    """
+    if size < 3:
+        raise ValueError("a world needs at least 3 regions")
+    if degree < 2:
+        raise ValueError("degree must be at least 2, the ring through every region")
+
+    points = rng.uniform(0, 1, size=(size, 2))
+    bands = max(1, int(numpy.sqrt(size)))
+    band = (points[:, 1] * bands).astype(numpy.int64)
+    # every other band runs right to left, so consecutive regions are close all along the ring
+    along = numpy.where(band % 2 == 0, points[:, 0], 1 - points[:, 0])
+    ring = numpy.lexsort((along, band))
+
+    extra = int(size * (degree - 2) / 2)
+    starts = rng.integers(0, size, extra)
+    steps = rng.geometric(0.3, extra) + 1
+    ends = numpy.where(
+        rng.uniform(0, 1, extra) < long_links,
+        rng.integers(0, size, extra),
+        (starts + steps) % size
+    )
+
+    start = numpy.concatenate([ring, ring[starts]])
+    end = numpy.concatenate([numpy.roll(ring, -1), ring[ends]])
+    keep = start != end
+    return start[keep], end[keep], points
+
+
+def generate(size, degree=4, distribution="lognormal", spread=1.5, long_links=0.05, seed=0):
+    """ a random world of size regions, as a (region table, {name: {neighbour: distance}}) pair
+
+    see populations and links for the options. links are the same distance both ways, 1 for
+    the closest regions up to MAX_DISTANCE, which long links usually are
+    """
+    rng = numpy.random.default_rng(seed)
+    names = ["Region " + str(num) for num in range(size)]
+    table = region_data.make_table(
+        names,
+        rng.uniform(0, 2000, size=size).round(),
+        populations(rng, size, distribution, spread)
+    )
+
+    start, end, points = links(rng, size, degree, long_links)
+    # scaled so the typical gap between neighbouring regions is a couple of steps
+    lengths = numpy.hypot(*(points[start] - points[end]).T) * numpy.sqrt(size) * 2
+    lengths = numpy.clip(numpy.ceil(lengths), 1, MAX_DISTANCE).astype(numpy.int64)
+
+    distances = {name: {} for name in names}
+    for region1, region2, distance in zip(start.tolist(), end.tolist(), lengths.tolist()):
+        distances[names[region1]][names[region2]] = distance
+        distances[names[region2]][names[region1]] = distance
+    return table, distances
+
+
+def write(directory, size, **options):
+    """ generates a world (see generate) and writes it to directory as regions_<size>.npy and
+    map_<size>.json, returns their paths, which World takes as region_file and distances
+    """
+    table, distances = generate(size, **options)
+    region_file = os.path.join(directory, "regions_" + str(size) + ".npy")
+    graph_file = os.path.join(directory, "map_" + str(size) + ".json")
+    numpy.save(region_file, table)
+    region_data.write_graph(graph_file, distances)
+    return region_file, graph_file
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.world_generator",
+        description="Writes a random world of any size as a region table and a region graph."
+    )
+    parser.add_argument("size", type=int, help="number of regions")
+    parser.add_argument("--directory", default="data")
+    parser.add_argument(
+        "--degree", type=float, default=4, help="mean links per region (default: 4)"
+    )
+    parser.add_argument("--populations", choices=POPULATIONS, default="lognormal")
+    parser.add_argument(
+        "--spread", type=float, default=1.5,
+        help="lognormal sigma or pareto shape of the populations (default: 1.5)"
+    )
+    parser.add_argument(
+        "--long-links", type=float, default=0.05,
+        help="fraction of the extra links joining random regions (default: 0.05)"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    region_file, graph_file = write(
+        args.directory, args.size, degree=args.degree, distribution=args.populations,
+        spread=args.spread, long_links=args.long_links, seed=args.seed
+    )
+    print("wrote " + region_file + " and " + graph_file)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import logging
+
+import pygame
+from src.assets import REGION_IMAGES, region_image_paths
+from src.scene import Blit
+
+log = logging.getLogger("main.world_map")
+log.setLevel(logging.INFO)
+
+# the region images are layers of one map of this size
+MAP_SIZE = (4312, 2128)
+BASE_IMAGE = REGION_IMAGES + "world_map.png"
+
+
+def region_image_path(name):
+    """ path of the map layer of the region called name """
+    return REGION_IMAGES + name.lower().replace(" ", "_") + ".png"
+
+
+class WorldMap:
+    """ draws the world map into a scene as a base layer and a tinted overlay per region
+
+    the base layer, the world map with every region layer in the assets on it, whether or not the
+    world has that region, is composited once per map size through the surface cache. each
+    region's overlay is its layer filled with the colour of its state, which is whether it is
+    destroyed or infected and how much of its population is left in POPULATION_SHADES steps.
+    refresh only replaces the overlays of regions whose state changed, so it is cheap to call
+    after every turn.
+    """
+
+    POPULATION_SHADES = 8
+    SEA = (30, 60, 110)
+    # overlay colour and alpha range (when no population is lost, when all of it is) per state
+    OVERLAYS = {
+        "healthy": ((0, 0, 0), (0, 150)),
+        "infected": ((200, 40, 40), (90, 210)),
+        "destroyed": ((40, 40, 40), (220, 220))
+    }
+
+    def __init__(self, graphics, world):
+        self.graphics = graphics
+        self.world = world
+
+        self.scene = None
+        self.size = (0, 0)  # size the map is drawn at
+        self.origin = (0, 0)  # where its top left corner is drawn
+        self.scale = 0
+        # per region id, its overlay Blit node and the state it shows
+        self.nodes = {}
+        self.states = {}
+
+    def attach(self, scene, rect, base_layer="map", overlay_layer="overlays"):
+        """ adds the map to a new scene, fitted and centred in rect, the map is only drawn in the
+        last scene it was attached to
+
+        overlays are created hidden, refresh shows them
+        """
+        self.scene = scene
+        self.nodes = {}
+        self.states = {}
+
+        rect = pygame.Rect(rect)
+        self.scale = min(rect.width / MAP_SIZE[0], rect.height / MAP_SIZE[1])
+        self.size = (int(MAP_SIZE[0] * self.scale), int(MAP_SIZE[1] * self.scale))
+        self.origin = (rect.centerx - self.size[0] // 2, rect.centery - self.size[1] // 2)
+
+        base = self.graphics.cache.get(("world map", self.size), self._draw_base)
+        scene.add(Blit(base, self.origin), base_layer)
+
+        for region in self.world.region_list:
+            sprite = self._sprite(region.name)
+            if sprite is None:
+                continue
+            surface = self._scaled(region_image_path(region.name), sprite)
+            self.nodes[region.id] = scene.add(
+                Blit(surface, self._dest(sprite), visible=False), overlay_layer
+            )
+
+    def _sprite(self, name):
+        try:
+            return self.graphics.assets.sprite(region_image_path(name))
+        except (pygame.error, FileNotFoundError):
+            log.debug("no map image for " + name)
+            return None
+
+    def _scaled(self, path, sprite):
+        """ the map layer at path at the map size """
+        width, height = sprite.surface.get_size()
+        size = (max(1, round(width * self.scale)), max(1, round(height * self.scale)))
+
+        def scale():
+            surface = sprite.surface
+            if surface.get_bitsize() < 24:
+                # smoothscale needs 24 or 32 bit pixels, the base map is paletted
+                surface = surface.convert_alpha()
+            return pygame.transform.smoothscale(surface, size)
+
+        return self.graphics.cache.get(("region layer", path, size), scale)
+
+    def _dest(self, sprite):
+        return (
+            self.origin[0] + round(sprite.offset[0] * self.scale),
+            self.origin[1] + round(sprite.offset[1] * self.scale)
+        )
+
+    def _draw_base(self):
+        base = pygame.Surface(self.size)
+        base.fill(self.SEA)
+        for path in [BASE_IMAGE] + region_image_paths():
+            sprite = self.graphics.assets.sprite(path)
+            base.blit(self._scaled(path, sprite), (
+                round(sprite.offset[0] * self.scale), round(sprite.offset[1] * self.scale)
+            ))
+        return base
+
+    def state(self, region, infections):
+        """ (kind, shade) shown for region, see OVERLAYS """
+        if region.destroyed:
+            return "destroyed", self.POPULATION_SHADES
+        initial = region.initial_population
+        lost = 1 - region.population / initial if initial else 0
+        shade = min(self.POPULATION_SHADES, max(0, round(lost * self.POPULATION_SHADES)))
+        for infection in infections:
+            if region in infection:
+                return "infected", shade
+        return "healthy", shade
+
+    def _overlay(self, region, colour, alpha):
+        """ the region's layer filled with colour at alpha """
+        path = region_image_path(region.name)
+        layer = self._scaled(path, self.graphics.assets.sprite(path))
+
+        def draw():
+            overlay = layer.copy()
+            # keep only the layer's shape then colour it in
+            overlay.fill((0, 0, 0, 255), special_flags=pygame.BLEND_RGBA_MULT)
+            overlay.fill(colour + (0,), special_flags=pygame.BLEND_RGBA_ADD)
+            overlay.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+            return overlay
+
+        return self.graphics.cache.get(
+            ("region overlay", region.name, layer.get_size(), colour, alpha), draw
+        )
+
+    def refresh(self, infections=()):
+        """ updates the overlays of regions whose state changed, infections are Infection sets
+        of the viruses shown. returns the ids of the regions that changed
+        """
+        changed = []
+        for region_id, node in self.nodes.items():
+            region = self.world.region_list[region_id]
+            state = self.state(region, infections)
+            if self.states.get(region_id) == state:
+                continue
+            self.states[region_id] = state
+            changed.append(region_id)
+
+            kind, shade = state
+            colour, (low, high) = self.OVERLAYS[kind]
+            alpha = low + (high - low) * shade // self.POPULATION_SHADES
+            if alpha > 0:
+                node.surface = self._overlay(region, colour, alpha)
+            node.visible = alpha > 0
+        return changed
@@ -1,6 +1,53 @@
 import tests.blocks as block
+import tests.simulation as simulation
+import tests.world as world
 
 
+if world.test_routes() is not True:
+    print("route tests failed")
+
+if world.test_graph_validation() is not True:
+    print("graph validation tests failed")
+
+if world.test_fork() is not True:
+    print("fork tests failed")
+
+if world.test_branches() is not True:
+    print("branch tests failed")
+
+if world.test_region_table() is not True:
+    print("region table tests failed")
+
+if world.test_generated_world() is not True:
+    print("generated world tests failed")
+
+if simulation.test_replay() is not True:
+    print("replay tests failed")
+
+if simulation.test_engine_rates() is not True:
+    print("engine rate tests failed")
+
+if simulation.test_viruses_turn() is not True:
+    print("multiple virus turn tests failed")
+
+if simulation.test_history() is not True:
+    print("history tests failed")
+
+if simulation.test_generated_batch() is not True:
+    print("generated world batch tests failed")
+
+if block.test_dirty_rects() is not True:
+    print("dirty rect tests failed")
+
+if block.test_virtual_list() is not True:
+    print("virtual list tests failed")
+
+if block.test_hit_index() is not True:
+    print("hit index tests failed")
+
+if block.test_surface_cache() is not True:
+    print("surface cache tests failed")
+
 blocks_file = block.test_file()
 
 if blocks_file is True:
@@ -4,6 +4,8 @@ import time
 import pygame
 import src.blocks as blocks
 import src.graphics as graphics
+from src.scene import Blit, Fill, Scene
+from src.widgets import HitIndex, VirtualList
 
 
 def test_file():
@@ -115,3 +117,140 @@ def test_cards(wait):
         display.blit(block.graphic.card, (0, 0))
         pygame.display.flip()
         time.sleep(wait)
+
+
+def test_surface_cache():
+    renderer = graphics.Graphics()
+    cache = renderer.cache
+    font = renderer.fonts["main"]
+
+    return_value = True
+    text = cache.text(font, "cache test", 40, (255, 255, 255))
+    if cache.text(font, "cache test", 40, (255, 255, 255)) is not text:
+        print("the same text was rendered twice")
+        return_value = False
+    if cache.text(font, "cache test", 41, (255, 255, 255)) is text:
+        print("text of a different size was taken from the cache")
+        return_value = False
+
+    image = renderer.images["world icon"]
+    if cache.scale(image, (30, 30)) is not cache.scale(image, (30, 30)):
+        print("the same image was scaled twice")
+        return_value = False
+
+    cache.max_bytes = cache.bytes
+    cache.scale(image, (40, 40))
+    if cache.bytes > cache.max_bytes or cache.evictions == 0:
+        print("the cache grew past max_bytes")
+        return_value = False
+
+    return return_value
+
+
+def test_dirty_rects():
+    """ checks that moving, hiding and removing a node redraws both where it was and where it is """
+    target = pygame.Surface((200, 100))
+    sprite = pygame.Surface((10, 10))
+    sprite.fill((255, 0, 0))
+    scene = Scene("background", "sprites")
+    scene.add(Fill((0, 0, 0)), "background")
+    node = scene.add(Blit(sprite, (10, 10)), "sprites")
+    scene.draw(target)
+    scene.finish_frame()
+    return_value = True
+
+    def check(change, expected, pixels):
+        areas = scene.draw_dirty(target)
+        scene.finish_frame()
+        if sorted(map(tuple, areas)) != sorted(expected):
+            print(change + " redrew " + str(areas) + ", expected " + str(expected))
+            return False
+        for point, colour in pixels.items():
+            if tuple(target.get_at(point))[:3] != colour:
+                print("after " + change + " " + str(point) + " wasn't " + str(colour))
+                return False
+        return True
+
+    node.dest = (50, 20)
+    return_value &= check(
+        "moving a node", [(10, 10, 10, 10), (50, 20, 10, 10)],
+        {(15, 15): (0, 0, 0), (55, 25): (255, 0, 0)}
+    )
+    node.visible = False
+    return_value &= check("hiding a node", [(50, 20, 10, 10)], {(55, 25): (0, 0, 0)})
+    node.visible = True
+    node.dest = (100, 50)
+    return_value &= check("showing a node", [(100, 50, 10, 10)], {(105, 55): (255, 0, 0)})
+    scene.remove(node, "sprites")
+    return_value &= check("removing a node", [(100, 50, 10, 10)], {(105, 55): (0, 0, 0)})
+    if scene.draw_dirty(target):
+        print("an unchanged scene redrew something")
+        return_value = False
+    return return_value
+
+
+def test_virtual_list():
+    """ checks which rows a scrolled list shows and hits, 20 high rows with 15 high cards """
+    card = pygame.Surface((50, 15))
+    rows = VirtualList(Scene("cards"), "cards", lambda num: card, 10, 10, 20, 100, length=10)
+    return_value = True
+
+    def check(scroll, expected, hits, length=10):
+        rows.layout(length, scroll)
+        if rows.visible() != expected or sorted(rows.nodes) != list(expected):
+            print("scrolled to " + str(scroll) + " showed " + str(sorted(rows.nodes)))
+            return False
+        for point, num in hits.items():
+            if rows.hit(point) != num:
+                print(
+                    "scrolled to " + str(scroll) + " " + str(point) + " hit "
+                    + str(rows.hit(point)) + ", expected " + str(num)
+                )
+                return False
+        return True
+
+    # the last row starts at 90, only its top 10 pixels are on screen
+    return_value &= check(0, range(0, 5), {(20, 95): 4, (20, 27): -1, (70, 15): -1})
+    # the first row is partly scrolled off the top and a sixth row starts at 95
+    return_value &= check(-15, range(0, 6), {(20, 2): 0, (20, 12): -1, (20, 20): 1, (20, 98): 5})
+    return_value &= check(-45, range(1, 7), {(20, 2): -1, (20, 10): 2, (20, 99): 6})
+    # scrolled to the end, nothing below the last row is hit
+    return_value &= check(-130, range(6, 10), {(20, 0): 6, (20, 75): -1})
+    return_value &= check(-1000, range(0), {(20, 50): -1})
+    return_value &= check(0, range(0), {(20, 15): -1}, length=0)
+    return return_value
+
+
+def test_hit_index():
+    """ checks the topmost of overlapping widgets is hit, misses and moving a widget """
+    hits = HitIndex(cell_size=50)
+    hits.add((0, 0, 100, 100), "back")
+    hits.add((40, 40, 40, 40), "middle")
+    hits.add((60, 60, 100, 20), "front")
+    return_value = True
+
+    def check(change, expected):
+        for point, widget in expected.items():
+            if hits.hit(point) != widget:
+                print(
+                    change + " " + str(point) + " hit " + str(hits.hit(point))
+                    + ", expected " + str(widget)
+                )
+                return False
+        return True
+
+    return_value &= check("added", {
+        (10, 10): "back", (45, 45): "middle", (70, 70): "front", (150, 70): "front",
+        (150, 10): None, (-5, 10): None, (500, 500): None
+    })
+    # moved under front and out of the cells it was in, it stays below front
+    hits.update((100, 60, 100, 40), "middle")
+    return_value &= check("moved", {
+        (45, 45): "back", (120, 70): "front", (120, 90): "middle", (190, 90): "middle"
+    })
+    hits.update((0, 0, 0, 0), "front")
+    return_value &= check("emptied", {(70, 70): "back", (120, 70): "middle"})
+    if len(hits) != 3:
+        print("the index holds " + str(len(hits)) + " widgets, expected 3")
+        return_value = False
+    return return_value
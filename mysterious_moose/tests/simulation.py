@@ -0,0 +1,200 @@
+import json
+import os
+import tempfile
+
+import numpy
+
+import src.batch as batch
+import src.events as events
+import src.history as history
+import src.turn_simulation as turn_simulation
+import src.vector_simulation as vector_simulation
+import src.virus as virus
+import src.world as world
+import src.world_generator as world_generator
+
+
+def play(engine, seed, turns):
+    """ plays a game, returning every event it reported """
+    rng = numpy.random.default_rng(seed)
+    earth = world.World()
+    test_virus = virus.Virus(10, 50, 70, industry=0, start_region=earth.regions["West Europe"])
+    sink = events.ListSink()
+    for turn in range(turns):
+        if turn_simulation.simulate_turn(earth, test_virus, engine, sink, rng) is None:
+            break
+    return [event.to_dict() for event in sink.events], earth.population
+
+
+def test_replay():
+    """ checks that games with the same seed replay identically """
+    return_value = True
+    for engine in ("object", "vector"):
+        for seed in range(5):
+            if play(engine, seed, 30) != play(engine, seed, 30):
+                print(engine + " engine game with seed " + str(seed) + " didn't replay the same")
+                return_value = False
+    return return_value
+
+
+def test_engine_rates(seeds=500, tolerance=0.06):
+    """ checks that both engines spread and cure at the same mean rate over a set of seeds """
+    engines = {
+        "object": turn_simulation.simulate_virus_changes,
+        "vector": vector_simulation.simulate_virus_changes
+    }
+    earth = world.World()
+    cases = {
+        # virulence 0 never spreads, so every change is a cure
+        "cure": lambda: virus.Virus(10, 0, 100, industry=0, start_region=earth.region_list[0]),
+        # detectability 0 never cures, so every change is an infection
+        "spread": lambda: virus.Virus(
+            10, 50, 0, industry=0, start_region=earth.regions["West Europe"]
+        )
+    }
+    return_value = True
+    for case, create in cases.items():
+        rates = {}
+        for engine, virus_changes in engines.items():
+            changed = 0
+            for seed in range(seeds):
+                test_virus = create()
+                if case == "cure":
+                    test_virus.affected_regions = earth.region_list
+                before = len(test_virus.infection)
+                virus_changes(earth, test_virus, rng=numpy.random.default_rng(seed))
+                changed += abs(len(test_virus.infection) - before)
+            rates[engine] = changed / seeds
+        if abs(rates["vector"] - rates["object"]) > tolerance * rates["object"]:
+            print(
+                case + " rate of the vector engine was " + str(rates["vector"])
+                + " regions a turn, the object engine's " + str(rates["object"])
+            )
+            return_value = False
+    return return_value
+
+
+def test_viruses_turn():
+    """ checks that a turn of several viruses matches the single virus turn for one virus, and
+    updates the world once for all of them
+    """
+    return_value = True
+    for seed in range(5):
+        rng = numpy.random.default_rng(seed)
+        earth = world.World()
+        test_virus = virus.Virus(10, 50, 70, industry=0, start_region=earth.regions["West Europe"])
+        sink = events.ListSink()
+        for turn in range(30):
+            if turn_simulation.simulate_viruses_turn(
+                    earth, [test_virus], "vector", sink, rng) is None:
+                break
+        played = ([event.to_dict() for event in sink.events], earth.population)
+        if played != play("vector", seed, 30):
+            print("one virus turns with seed " + str(seed) + " didn't match simulate_turn")
+            return_value = False
+
+    for engine in ("object", "vector"):
+        earth = world.World()
+        viruses = [
+            virus.Virus(10, 50, 70, industry=0, start_region=earth.regions["West Europe"]),
+            virus.Virus(20, 50, 70, industry=2, start_region=earth.regions["China"])
+        ]
+        co2 = earth.co2_concentration + sum(map(turn_simulation.virus_co2, viruses))
+        before = earth.population
+        rng = numpy.random.default_rng(0)
+        turn_simulation.simulate_viruses_turn(earth, viruses, engine, rng=rng)
+        deaths = sum(
+            numpy.ceil((co2 - 300) * region.initial_population / 7000000000)
+            for region in earth.region_list
+        )
+        if earth.co2_concentration != co2 or before - earth.population != deaths:
+            print(engine + " engine didn't update the world once for every virus")
+            return_value = False
+    return return_value
+
+
+def test_history():
+    """ checks that a recorded game matches the world turn by turn and survives being saved """
+    earth = world.World()
+    spec = batch.VirusSpec(1000, 90, 5, 0, "West Europe")
+    # a small capacity so the arrays have to grow during the game
+    recorder = history.History(earth, capacity=2)
+    result = batch.run_game(spec, 3, 40, "vector", earth, recorder)
+    return_value = True
+
+    if len(recorder) != result.turns + 1:
+        print("history has " + str(len(recorder)) + " rows for " + str(result.turns) + " turns")
+        return_value = False
+    if not numpy.array_equal(recorder.populations[0], earth.initial_populations):
+        print("history didn't start with the initial populations")
+        return_value = False
+    if not numpy.array_equal(recorder.populations[-1], earth.populations):
+        print("history didn't end with the final populations")
+        return_value = False
+    if recorder.co2_concentration[-1] != earth.co2_concentration:
+        print("history didn't end with the final CO2 concentration")
+        return_value = False
+    start = earth.regions["West Europe"].id
+    if recorder.infected[0][start] != 1 or recorder.infected[0].sum() != 1:
+        print("history didn't start with only the start region infected")
+        return_value = False
+
+    with tempfile.TemporaryDirectory() as directory:
+        recorder.save(os.path.join(directory, "game.npz"))
+        loaded = history.History.load(os.path.join(directory, "game.npz"))
+        for name in history.WORLD_COLUMNS + ("populations", "infected"):
+            if not numpy.array_equal(getattr(loaded, name), getattr(recorder, name)):
+                print("saved history " + name + " didn't load back the same")
+                return_value = False
+
+        # an empty history must load with room to record onto
+        recorder.clear()
+        recorder.save(os.path.join(directory, "empty.npz"))
+        loaded = history.History.load(os.path.join(directory, "empty.npz"))
+        loaded.record(earth)
+        loaded.record(earth)
+        if len(loaded) != 2 or not numpy.array_equal(loaded.populations[1], earth.populations):
+            print("recording onto a loaded empty history didn't append turns")
+            return_value = False
+
+        recorder.record(earth)
+        recorder.write_csv(os.path.join(directory, "game.csv"))
+        with open(os.path.join(directory, "game.csv")) as csv_file:
+            lines = csv_file.read().splitlines()
+        columns = 1 + len(history.WORLD_COLUMNS) + 2 * len(earth.regions)
+        if len(lines) != len(recorder) + 1 or len(lines[1].split(",")) != columns:
+            print("history csv didn't have a header and a row of every column per turn")
+            return_value = False
+    return return_value
+
+
+def test_generated_batch():
+    """ checks that batches run on a generated world's table and graph, in and out of a pool """
+    spec = batch.VirusSpec(1000, 90, 5, 0, "Region 0")
+    return_value = True
+    with tempfile.TemporaryDirectory() as directory:
+        region_file, map_file = world_generator.write(directory, 200, seed=1)
+        statistics = batch.run_batch(
+            spec, range(4), 30, "vector", region_file=region_file, map_file=map_file
+        ).summary()
+        pooled = batch.run_parallel(
+            spec, range(4), 30, "vector", workers=2, chunk_size=1, region_file=region_file,
+            map_file=map_file
+        ).summary()
+
+        output = os.path.join(directory, "statistics.json")
+        batch.main([
+            "--impact", "1000", "--virulence", "90", "--detectability", "5",
+            "--start-region", "Region 0", "--seeds", "0", "4", "--max-turns", "30",
+            "--engine", "vector", "--regions", region_file, "--map", map_file, "--output", output
+        ])
+        with open(output) as output_file:
+            command = json.load(output_file)
+
+    if statistics["games"] != 4:
+        print("a generated world batch played " + str(statistics["games"]) + " games, not 4")
+        return_value = False
+    if pooled != statistics or command != statistics:
+        print("a generated world batch differed between run_batch, run_parallel and --map")
+        return_value = False
+    return return_value
@@ -0,0 +1,207 @@
+import itertools
+import os
+import tempfile
+
+import numpy
+
+import src.branches as branches
+import src.region_data as region_data
+import src.virus as virus
+import src.world as world
+import src.world_generator as world_generator
+
+
+def test_routes():
+    """ checks the route table against the total weight of every simple path """
+    earth = world.World()
+    graph = earth.distances
+    return_value = True
+
+    def simple_paths(start, end, path):
+        if start == end:
+            yield path
+            return
+        for node in graph.get(start, {}):
+            if node not in path:
+                yield from simple_paths(node, end, path + [node])
+
+    for region1, region2 in itertools.product(earth.regions.values(), repeat=2):
+        best = min(
+            sum(graph[a][b] for a, b in zip(path, path[1:]))
+            for path in simple_paths(region1.name, region2.name, [region1.name])
+        )
+        distance = earth.distance_between(region1, region2)
+        if distance != best:
+            print(
+                "distance from " + region1.name + " to " + region2.name + " was "
+                + str(distance) + ", expected " + str(best)
+            )
+            return_value = False
+
+        path = earth.path_between(region1, region2)
+        if sum(graph[a][b] for a, b in zip(path, path[1:])) != distance:
+            print(
+                "path from " + region1.name + " to " + region2.name + " didn't match its distance"
+            )
+            return_value = False
+
+    fork = earth.fork()
+    earth.set_distance("USA", "Canada", 1)
+    if earth.distance_between(earth.regions["Canada"], earth.regions["USA"]) != 1:
+        print("route table wasn't rebuilt after the graph changed")
+        return_value = False
+    if fork.distance_between(fork.regions["USA"], fork.regions["Canada"]) != 3:
+        print("changing one world's graph changed the graph of its fork")
+        return_value = False
+
+    return return_value
+
+
+def test_graph_validation():
+    """ checks that region graphs which aren't a map are refused """
+    graph = world.World().distances
+    return_value = True
+
+    broken = {
+        "an asymmetric link": {**graph, "USA": {**graph["USA"], "Canada": 9}},
+        "a missing region": {**graph, "Russia": {"China": 6}},
+        "a disconnected region": {
+            name: {
+                neighbour: distance for neighbour, distance in links.items() if neighbour != "Cuba"
+            }
+            for name, links in graph.items() if name != "Cuba"
+        }
+    }
+    for problem, distances in broken.items():
+        try:
+            world.World(distances=distances)
+        except ValueError:
+            continue
+        print("a graph with " + problem + " was accepted")
+        return_value = False
+    return return_value
+
+
+def test_fork():
+    """ checks that forks and restored snapshots don't share changing state """
+    earth = world.World()
+    snapshot = earth.snapshot()
+    fork = snapshot.fork()
+    return_value = True
+
+    fork.regions["USA"].population = 0
+    fork.destroyed[0] = True
+    if earth.regions["USA"].population == 0 or earth.destroyed[0]:
+        print("changing a fork changed the world it came from")
+        return_value = False
+    if fork.population != earth.population - earth.regions["USA"].population:
+        print("fork population total wasn't kept up to date")
+        return_value = False
+
+    earth.regions["China"].population = 0
+    earth.restore(snapshot)
+    if earth.regions["China"].population != earth.regions["China"].initial_population:
+        print("restoring a snapshot didn't restore region populations")
+        return_value = False
+    if earth.population != sum(region.population for region in earth.region_list):
+        print("restoring a snapshot didn't restore the population total")
+        return_value = False
+
+    return return_value
+
+
+def test_branches():
+    """ checks that branches played from a snapshot keep their own region graph """
+    earth = world.World()
+    usa, canada = earth.regions["USA"], earth.regions["Canada"]
+    snapshot = earth.snapshot()
+    branch1, branch2 = snapshot.fork(), snapshot.fork()
+    return_value = True
+
+    branch1.set_distance("USA", "Canada", 1)
+    if branch2.distance_between(branch2.regions["USA"], branch2.regions["Canada"]) != 3:
+        print("changing one branch's graph changed another branch")
+        return_value = False
+    if earth.distance_between(usa, canada) != 3:
+        print("changing a branch's graph changed the world it was forked from")
+        return_value = False
+
+    # changes made after the snapshot don't reach its forks or restores
+    earth.set_distance("USA", "Canada", 1)
+    fork = snapshot.fork()
+    if fork.distance_between(fork.regions["USA"], fork.regions["Canada"]) != 3:
+        print("a fork picked up a distance changed after its snapshot was taken")
+        return_value = False
+    earth.restore(snapshot)
+    if earth.distance_between(usa, canada) != 3:
+        print("restoring a snapshot didn't restore its region graph")
+        return_value = False
+
+    candidates = [
+        virus.Virus(10, 50, 70, industry=0, start_region=earth.regions["West Europe"]),
+        virus.Virus(1000, 90, 5, industry=2, start_region=earth.regions["China"])
+    ]
+    outcomes = branches.run_branches(snapshot, candidates, 20, seeds=(0, 1, 2))
+    if len(outcomes) != 6 or earth.population != snapshot.population:
+        print("running branches didn't play every branch on its own fork")
+        return_value = False
+    summaries = branches.compare_branches(outcomes)
+    if [summary["branches"] for summary in summaries] != [3, 3] or (
+            summaries[0]["population"] > summaries[1]["population"]):
+        print("compared branches weren't grouped per candidate and ordered by population")
+        return_value = False
+    return return_value
+
+
+def test_region_table():
+    """ checks that a world loaded from a converted .npy table matches one loaded from the tsv """
+    with tempfile.TemporaryDirectory() as directory:
+        table_file = os.path.join(directory, "regions.npy")
+        region_data.convert("data/regions.txt", table_file)
+        text_world = world.World()
+        table_world = world.World(table_file)
+
+        return_value = True
+        if list(text_world.regions) != list(table_world.regions):
+            print("region names or order differ between the tsv and .npy table")
+            return_value = False
+        for name in ("initial_populations", "populations", "elevations"):
+            if not numpy.array_equal(getattr(text_world, name), getattr(table_world, name)):
+                print(name + " differ between the tsv and .npy table")
+                return_value = False
+        # the table is shared, so it must not be writable
+        if table_world.initial_populations.flags.writeable:
+            print("the .npy table's initial populations are writable")
+            return_value = False
+        del table_world
+    return return_value
+
+
+def test_generated_world():
+    """ checks that a generated world loads, is connected and has the asked for size and degree """
+    with tempfile.TemporaryDirectory() as directory:
+        region_file, graph_file = world_generator.write(directory, 500, degree=4, seed=1)
+        generated = world.World(region_file, graph_file)
+
+        return_value = True
+        if len(generated.region_list) != 500:
+            print("generated world has " + str(len(generated.region_list)) + " regions")
+            return_value = False
+        degree = sum(len(links) for links in generated.distances.values()) / 500
+        if not 3.5 <= degree <= 4:
+            print("generated world has mean degree " + str(degree))
+            return_value = False
+        for name, links in generated.distances.items():
+            for neighbour, distance in links.items():
+                if generated.distances[neighbour].get(name) != distance:
+                    print("link " + name + " - " + neighbour + " differs each way")
+                    return_value = False
+        start = generated.region_list[0]
+        try:
+            for region in generated.region_list:
+                generated.distance_between(start, region)
+        except ValueError as error:
+            print("generated world is not connected: " + str(error))
+            return_value = False
+        del generated
+    return return_value